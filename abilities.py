@@ -1,15 +1,23 @@
 import pygame
 import math
+import assets
+import pooling
+import timing
 from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from render import interpolate_rect
+
+# Number of pre-rotated bolt sprites, one per 360 / BOLT_ANGLE_STEPS degrees
+BOLT_ANGLE_STEPS = 64
 
 
 class Ability:
     """Base class for every passive ability."""
 
-    def __init__(self, name, cooldown_frames):
+    def __init__(self, name, cooldown):
         self.name = name
-        self.cooldown_frames = cooldown_frames
-        self._timer = 0
+        # Seconds between shots
+        self.cooldown = cooldown
+        self._timer = 0.0
 
     def ready(self):
         """True when the ability may fire."""
@@ -17,12 +25,12 @@ class Ability:
 
     def start_cooldown(self):
         """Called right after the ability fires."""
-        self._timer = self.cooldown_frames
+        self._timer = self.cooldown
 
-    def update(self):
-        """Call every frame – counts down."""
+    def update(self, dt=timing.FIXED_DT):
+        """Call every simulation step – counts down dt seconds."""
         if self._timer > 0:
-            self._timer -= 1
+            self._timer -= dt
 
     def fire(self, player, enemies):
         """Override in subclasses – what the ability actually does."""
@@ -30,108 +38,123 @@ class Ability:
 
 
 class AutomaticCrossbow(Ability):
+    COOLDOWN = 1.5
+
     def __init__(self):
-        super().__init__("automatic crossbow", cooldown_frames=90)
+        super().__init__("automatic crossbow", cooldown=self.COOLDOWN)
 
     def fire(self, player, enemies):
-        if not enemies:
-            return
-        closest = min(
-            enemies,
-            key=lambda e: math.hypot(
-                e.rect.centerx - player.pos.centerx, e.rect.centery - player.pos.centery
-            ),
-        )
         MAX_RANGE = 500
-        dist = math.hypot(
-            closest.rect.centerx - player.pos.centerx,
-            closest.rect.centery - player.pos.centery,
+        found = enemies.nearest(
+            player.pos.centerx, player.pos.centery, max_distance=MAX_RANGE
         )
-        if dist > MAX_RANGE:
+        if found is None:
             return
+        closest, _ = found
 
         # Spawn bolt towards target
         start_x, start_y = player.pos.center
         target_x, target_y = closest.rect.center
-        bolt = Bolt(start_x, start_y, target_x, target_y)
+        bolt = bolt_pool.acquire(start_x, start_y, target_x, target_y)
 
         # Add to bolt list
         player.bolts.append(bolt)
 
 
 class ThrowingAxes(Ability):
+    COOLDOWN = 1.5
+
     def __init__(self):
-        super().__init__("throwing axes", cooldown_frames=90)
+        super().__init__("throwing axes", cooldown=self.COOLDOWN)
 
     def fire(self, player, enemies=None):
         start_x, start_y = player.pos.center
-        axe_up = Axe(start_x, start_y, "up")
-        axe_down = Axe(start_x, start_y, "down")
+        axe_up = axe_pool.acquire(start_x, start_y, "up")
+        axe_down = axe_pool.acquire(start_x, start_y, "down")
 
         player.axes.append(axe_up)
         player.axes.append(axe_down)
 
 
 class WildFlail(Ability):
+    COOLDOWN = 0
+
     def __init__(self):
-        super().__init__("wild flail", cooldown_frames=0)
+        super().__init__("wild flail", cooldown=self.COOLDOWN)
 
     def fire(self, player, enemies=None):
         if len(player.flails) < 1:
-            flail = Flail()
+            flail = flail_pool.acquire()
             player.flails.append(flail)
 
 
 class Flail:
     def __init__(self):
         self.pos = pygame.Rect(0, 0, 12, 12)
+        self.reset()
 
-        self.image = pygame.image.load(
-            "./assets/images/items/flail.png"
-        ).convert_alpha()
+    def reset(self):
+        self.pos.size = (12, 12)
+        self.image = assets.load_image("./assets/images/items/flail.png")
         self.radius = 100.0
         self.angle = 0.0
-        self.orbit_speed = 0.025
-
-    def update(self, player, enemies):
-        self.angle += self.orbit_speed
+        # Radians per second
+        self.orbit_speed = 1.5
+        # No previous position until the first update places the flail
+        self.prev_center = None
+
+    def update(self, player, enemies, dt=timing.FIXED_DT):
+        previous = self.pos.center
+        self.angle += self.orbit_speed * dt
         self.pos.centerx = player.hitbox.centerx + self.radius * math.cos(self.angle)
         self.pos.centery = player.hitbox.centery + self.radius * math.sin(self.angle)
+        self.prev_center = self.pos.center if self.prev_center is None else previous
 
-        for enemy in enemies:
-            if self.pos.colliderect(enemy.hitbox):
-                enemy.take_damage(2)
-                return True
+        enemy = enemies.first_rect(self.pos)
+        if enemy is not None:
+            enemy.take_damage(2)
+            return True
 
         return False
 
-    def draw(self, surface):
-        surface.blit(self.image, self.pos)
+    def draw(self, surface, alpha=1.0):
+        return surface.blit(
+            self.image,
+            interpolate_rect(self.pos, self.prev_center or self.pos.center, alpha),
+        )
 
 
 class Axe:
-    def __init__(self, start_x, start_y, direction, speed=3):
+    def __init__(self, start_x, start_y, direction, speed=180):
         self.pos = pygame.Rect(0, 0, 45, 48)
+        self.reset(start_x, start_y, direction, speed)
+
+    def reset(self, start_x, start_y, direction, speed=180):
+        self.pos.size = (45, 48)
         self.pos.center = (start_x, start_y)
 
-        self.image = pygame.image.load("./assets/images/items/axe.png").convert_alpha()
+        self.image = assets.load_image("./assets/images/items/axe.png")
 
         self.direction = direction
+        # Pixels per second
         self.speed = speed
+        self.prev_center = self.pos.center
 
-        self.max_age = 180
-        self.age = 0
+        # Seconds
+        self.max_age = 3.0
+        self.age = 0.0
 
-    def update(self, enemies):
+    def update(self, enemies, dt=timing.FIXED_DT):
+        self.prev_center = self.pos.center
         if self.direction == "up":
-            self.pos.y += self.speed
+            self.pos.y += self.speed * dt
         else:
-            self.pos.y -= self.speed
+            self.pos.y -= self.speed * dt
 
-        for enemy in enemies:
-            if self.pos.colliderect(enemy.hitbox):
-                enemy.take_damage(4)
-                return True
+        enemy = enemies.first_rect(self.pos)
+        if enemy is not None:
+            enemy.take_damage(4)
+            return True
 
         # Remove if too old or off-screen
         if (
@@ -144,14 +167,18 @@ class Axe:
             return True
         return False
 
-    def draw(self, surface):
-        surface.blit(self.image, self.pos)
+    def draw(self, surface, alpha=1.0):
+        return surface.blit(
+            self.image, interpolate_rect(self.pos, self.prev_center, alpha)
+        )
 
 
 class Bolt:
-    def __init__(self, start_x, start_y, target_x, target_y, target=None, speed=4):
+    def __init__(self, start_x, start_y, target_x, target_y, target=None, speed=240):
         self.pos = pygame.Rect(0, 0, 12, 6)
-        self.pos.center = (start_x, start_y)
+        self.reset(start_x, start_y, target_x, target_y, target, speed)
+
+    def reset(self, start_x, start_y, target_x, target_y, target=None, speed=240):
         self.target = target
 
         dx = target_x - start_x
@@ -163,28 +190,29 @@ class Bolt:
         else:
             self.vel_x = self.vel_y = 0
 
-        # Load image of Bolt
-        self.image = pygame.image.load("./assets/images/items/bolt.png").convert_alpha()
-
         # face in correct direction
         angle = math.degrees(math.atan2(self.vel_y, self.vel_x))
-        self.image = pygame.transform.rotate(self.image, -angle)
-        self.image = pygame.transform.scale(self.image, (50, 15))
-        self.pos = self.image.get_rect(center=(start_x, start_y))
+        self.image = assets.rotated_sprite(
+            "./assets/images/items/bolt.png", size=(50, 15), steps=BOLT_ANGLE_STEPS
+        ).get(angle)
+        self.pos.size = self.image.get_size()
+        self.pos.center = (start_x, start_y)
+        self.prev_center = self.pos.center
 
         # Bolt disappears after 3 seconds
-        self.max_age = 180
-        self.age = 0
-
-    def update(self, enemies):
-        self.pos.x += self.vel_x
-        self.pos.y += self.vel_y
-        self.age += 1
-
-        for enemy in enemies:
-            if self.pos.colliderect(enemy.hitbox):
-                enemy.take_damage(1)
-                return True
+        self.max_age = 3.0
+        self.age = 0.0
+
+    def update(self, enemies, dt=timing.FIXED_DT):
+        self.prev_center = self.pos.center
+        self.pos.x += self.vel_x * dt
+        self.pos.y += self.vel_y * dt
+        self.age += dt
+
+        enemy = enemies.first_rect(self.pos)
+        if enemy is not None:
+            enemy.take_damage(1)
+            return True
 
         # Remove if too old or off-screen
         if (
@@ -197,5 +225,13 @@ class Bolt:
             return True
         return False
 
-    def draw(self, surface):
-        surface.blit(self.image, self.pos)
+    def draw(self, surface, alpha=1.0):
+        return surface.blit(
+            self.image, interpolate_rect(self.pos, self.prev_center, alpha)
+        )
+
+
+# Recycled projectiles, shared by every ability that fires them
+bolt_pool = pooling.Pool(Bolt)
+axe_pool = pooling.Pool(Axe)
+flail_pool = pooling.Pool(Flail)
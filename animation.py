@@ -1,4 +1,11 @@
+import json
+import os
 import pygame
+import assets
+import timing
+
+# Visible bounds of every sprite sheet frame, computed once per sheet file
+BOUNDS_CACHE_PATH = "./.cache/sprite_bounds.json"
 
 
 class SpriteSheet:
@@ -8,7 +15,8 @@ class SpriteSheet:
         - filename: path to sprite sheet
         - frame_count: Number of frames in the row
         """
-        self.sheet = pygame.image.load(filename).convert_alpha()
+        self.filename = filename
+        self.sheet = assets.load_image(filename)
         self.frame_count = frame_count
         self.frame_width = 128
         self.frame_height = 128
@@ -32,6 +40,19 @@ class SpriteSheet:
             frame = self.sheet.subsurface(rect)
             self.frames.append(frame)
 
+        # Mirrored copies for left-facing draws, built once here
+        self.flipped_frames = [
+            pygame.transform.flip(frame, True, False) for frame in self.frames
+        ]
+        self._bounds = None
+
+    @property
+    def bounds(self):
+        """(left, top, right, bottom) of the visible pixels of each frame."""
+        if self._bounds is None:
+            self._bounds = bounds_cache.get(self)
+        return self._bounds
+
 
 class Animation:
     def __init__(self, sprite_sheet, base_fps=12, loop=True, speed_multiplier=1.0):
@@ -41,13 +62,13 @@ class Animation:
         self.frame_delay = int(1000 / (base_fps * speed_multiplier))
         self.loop = loop
         self.current_frame = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = timing.get_ticks()
         self.finished = False
 
     def update(self):
         if self.finished:
             return
-        now = pygame.time.get_ticks()
+        now = timing.get_ticks()
         if now - self.last_update > self.frame_delay:
             self.last_update = now
             self.current_frame += 1
@@ -74,56 +95,69 @@ class Animation:
     def reset(self):
         self.current_frame = 0
         self.finished = False
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = timing.get_ticks()
 
 
-def get_center_offset(sheet: SpriteSheet, frame_index: int = 0) -> tuple[int, int]:
-    frame = sheet.frames[frame_index]
+def frame_bounds(frame):
+    """(left, top, right, bottom) of the visible pixels of a frame, edges
+    inclusive. A fully transparent frame spans the whole frame."""
     w, h = frame.get_size()
+    # threshold=0 marks every pixel with alpha > 0
+    rects = pygame.mask.from_surface(frame, 0).get_bounding_rects()
+    if not rects:
+        return 0, 0, w - 1, h - 1
+    box = rects[0].unionall(rects[1:])
+    return box.left, box.top, box.right - 1, box.bottom - 1
+
+
+class BoundsCache:
+    """Per-frame sprite bounds persisted as JSON, keyed by the hash of the
+    sheet file and its frame layout, so an unchanged sheet is never
+    scanned twice. Failing to read or write the file only costs a rescan.
+    """
+
+    def __init__(self, path=BOUNDS_CACHE_PATH):
+        self.path = path
+        self.entries = None
+
+    def load(self):
+        if self.entries is None:
+            try:
+                with open(self.path) as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                self.entries = {}
+        return self.entries
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "w") as file:
+                json.dump(self.entries, file, sort_keys=True)
+        except OSError:
+            pass
+
+    def get(self, sheet):
+        key = "{}:{}x{}x{}".format(
+            assets.registry.digest(sheet.filename),
+            sheet.frame_count,
+            sheet.frame_width,
+            sheet.frame_height,
+        )
+        entries = self.load()
+        bounds = entries.get(key)
+        if bounds is None:
+            bounds = [frame_bounds(frame) for frame in sheet.frames]
+            entries[key] = bounds
+            self.save()
+        return [tuple(box) for box in bounds]
+
+
+bounds_cache = BoundsCache()
+
 
-    # Find left-most non-transparent pixel
-    left = 0
-    for x in range(w):
-        for y in range(h):
-            if frame.get_at((x, y))[3] > 0:  # alpha > 0
-                left = x
-                break
-        else:
-            continue
-        break
-
-    # Find right-most
-    right = w - 1
-    for x in range(w - 1, -1, -1):
-        for y in range(h):
-            if frame.get_at((x, y))[3] > 0:
-                right = x
-                break
-        else:
-            continue
-        break
-
-    # Find top-most
-    top = 0
-    for y in range(h):
-        for x in range(w):
-            if frame.get_at((x, y))[3] > 0:
-                top = y
-                break
-        else:
-            continue
-        break
-
-    # Find bottom-most
-    bottom = h - 1
-    for y in range(h - 1, -1, -1):
-        for x in range(w):
-            if frame.get_at((x, y))[3] > 0:
-                bottom = y
-                break
-        else:
-            continue
-        break
+def get_center_offset(sheet: SpriteSheet, frame_index: int = 0) -> tuple[int, int]:
+    left, top, right, bottom = sheet.bounds[frame_index]
 
     # Visual center
     center_x = (left + right) // 2
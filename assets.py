@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+import pygame
+
+# Written by atlas.py; without it every image is loaded from its own file
+ATLAS_MANIFEST = "./assets/atlas/atlas.json"
+
+
+class AssetRegistry:
+    """Decodes every image once and hands out shared surfaces keyed by path.
+
+    Images packed into the texture atlas come back as subsurfaces of its
+    pages, so all of them share a handful of decoded surfaces.
+    """
+
+    def __init__(self, atlas_manifest=ATLAS_MANIFEST):
+        self.surfaces = {}
+        self.rotations = {}
+        self.digests = {}
+        self.hits = 0
+        self.misses = 0
+        self.atlas_manifest = atlas_manifest
+        # Filled from the manifest on first use
+        self.atlas = None
+        self.atlas_dir = None
+        self.page_names = []
+
+    def key(self, path):
+        return os.path.normcase(os.path.normpath(path))
+
+    def load_atlas(self):
+        if self.atlas is not None:
+            return self.atlas
+        self.atlas = {}
+        if self.atlas_manifest is None:
+            return self.atlas
+        try:
+            with open(self.atlas_manifest) as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return self.atlas
+        self.atlas_dir = os.path.dirname(self.atlas_manifest)
+        self.page_names = manifest["pages"]
+        self.atlas = {
+            self.key(path): entry for path, entry in manifest["sprites"].items()
+        }
+        return self.atlas
+
+    def page_paths(self):
+        """Paths of the atlas page images, empty without an atlas."""
+        self.load_atlas()
+        return [os.path.join(self.atlas_dir, name) for name in self.page_names]
+
+    def page(self, index):
+        # Pages are cached like any other image
+        return self.image(os.path.join(self.atlas_dir, self.page_names[index]))
+
+    def has(self, path, alpha=True):
+        return (self.key(path), alpha) in self.surfaces
+
+    def install(self, path, surface, alpha=True):
+        """Cache an already converted surface for path, e.g. one decoded
+        by the startup preloader."""
+        self.surfaces[(self.key(path), alpha)] = surface
+
+    def image(self, path, alpha=True):
+        """Shared surface for path. Callers must not draw onto it."""
+        key = (self.key(path), alpha)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        entry = self.load_atlas().get(key[0]) if alpha else None
+        if entry is not None:
+            surface = self.page(entry["page"]).subsurface(entry["rect"])
+        else:
+            surface = pygame.image.load(path)
+            surface = surface.convert_alpha() if alpha else surface.convert()
+        self.surfaces[key] = surface
+        return surface
+
+    def digest(self, path):
+        """SHA-1 of an image file, taken from the atlas manifest when the
+        image is packed so the file is not read again."""
+        key = self.key(path)
+        digest = self.digests.get(key)
+        if digest is None:
+            entry = self.load_atlas().get(key)
+            if entry is not None:
+                digest = entry["sha1"]
+            else:
+                with open(path, "rb") as file:
+                    digest = hashlib.sha1(file.read()).hexdigest()
+            self.digests[key] = digest
+        return digest
+
+    def rotated(self, path, size=None, steps=64):
+        """Shared RotatedSprite for path, so every projectile of a kind reuses it."""
+        key = (self.key(path), size, steps)
+        sprite = self.rotations.get(key)
+        if sprite is None:
+            sprite = RotatedSprite(self, path, size, steps)
+            self.rotations[key] = sprite
+        return sprite
+
+    def resident_bytes(self):
+        # Atlas subsurfaces share their page's pixels, which are counted once
+        surfaces = [s for s in self.surfaces.values() if s.get_parent() is None]
+        for sprite in self.rotations.values():
+            surfaces.extend(frame for frame in sprite.frames if frame is not None)
+        return sum(s.get_pitch() * s.get_height() for s in surfaces)
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "surfaces": len(self.surfaces),
+            "atlas_pages": sum(self.has(path) for path in self.page_paths()),
+            "resident_bytes": self.resident_bytes(),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (
+            f"Assets: {stats['surfaces']} surfaces "
+            f"({stats['atlas_pages']} atlas pages), "
+            f"{stats['resident_bytes'] / 1024:.0f} KiB resident, "
+            f"{stats['hits']} hits / {stats['misses']} misses"
+        )
+
+
+class RotatedSprite:
+    """Rotated (then optionally scaled) copies of one image, quantized to
+    `steps` angle buckets and filled lazily on first use."""
+
+    def __init__(self, registry, path, size=None, steps=64):
+        if steps < 1:
+            raise ValueError(f"Rotation steps must be positive, got {steps}.")
+        self.registry = registry
+        self.path = path
+        self.size = size
+        self.steps = steps
+        self.step_degrees = 360 / steps
+        self.frames = [None] * steps
+
+    def bucket(self, angle):
+        """Bucket index for an angle in degrees (screen space, y down)."""
+        return round(angle / self.step_degrees) % self.steps
+
+    def get(self, angle):
+        index = self.bucket(angle)
+        frame = self.frames[index]
+        if frame is None:
+            image = self.registry.image(self.path)
+            frame = pygame.transform.rotate(image, -index * self.step_degrees)
+            if self.size is not None:
+                frame = pygame.transform.scale(frame, self.size)
+            self.frames[index] = frame
+        return frame
+
+
+# Process-wide registry shared by every module
+registry = AssetRegistry()
+
+
+def load_image(path, alpha=True):
+    return registry.image(path, alpha)
+
+
+def rotated_sprite(path, size=None, steps=64):
+    return registry.rotated(path, size, steps)
@@ -0,0 +1,134 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pygame
+
+# Everything drawn as a sprite; backgrounds are full-screen and stay separate
+SOURCE_PATTERNS = (
+    "assets/images/enemies/**/*.png",
+    "assets/images/items/*.png",
+    "assets/images/user-interface/*.png",
+    "assets/images/player.png",
+    "assets/animations/**/*.png",
+)
+OUTPUT_DIR = "assets/atlas"
+MANIFEST_NAME = "atlas.json"
+PAGE_SIZE = 2048
+# Transparent gap around every sprite so scaled or rotated copies never
+# pick up a neighbour's pixels
+PADDING = 2
+
+
+def find_sources(patterns=SOURCE_PATTERNS):
+    paths = set()
+    for pattern in patterns:
+        paths.update(glob.glob(pattern, recursive=True))
+    return sorted(path.replace(os.sep, "/") for path in paths)
+
+
+def pack(sizes, page_size=PAGE_SIZE, padding=PADDING):
+    """Shelf-pack (width, height) boxes onto square pages.
+
+    Boxes are placed tallest first, left to right along shelves that are
+    as tall as their first box. Returns one (page, x, y) per box, in the
+    order of `sizes`.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    placements = [None] * len(sizes)
+    page = 0
+    x = y = shelf_height = padding
+    for i in order:
+        width, height = sizes[i]
+        if width + 2 * padding > page_size or height + 2 * padding > page_size:
+            raise ValueError(f"A {width}x{height} sprite does not fit a page.")
+        if x + width + padding > page_size:
+            # Next shelf
+            x = padding
+            y += shelf_height + padding
+            shelf_height = 0
+        if y + height + padding > page_size:
+            # Next page
+            page += 1
+            x = y = padding
+            shelf_height = 0
+        placements[i] = (page, x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    return placements
+
+
+def build(sources=None, output_dir=OUTPUT_DIR, page_size=PAGE_SIZE):
+    """Pack the source images into atlas pages and write them together
+    with a JSON manifest of every sprite's page and rect. Returns the
+    manifest."""
+    if sources is None:
+        sources = find_sources()
+    images = []
+    digests = []
+    for path in sources:
+        with open(path, "rb") as file:
+            data = file.read()
+        digests.append(hashlib.sha1(data).hexdigest())
+        images.append(pygame.image.load(path).convert_alpha())
+
+    sizes = [image.get_size() for image in images]
+    placements = pack(sizes, page_size)
+
+    # Each page is only as large as the sprites on it need
+    extents = {}
+    for (width, height), (page, x, y) in zip(sizes, placements):
+        right, bottom = extents.get(page, (0, 0))
+        extents[page] = (
+            max(right, x + width + PADDING),
+            max(bottom, y + height + PADDING),
+        )
+    pages = [pygame.Surface(extents[page], pygame.SRCALPHA) for page in sorted(extents)]
+
+    sprites = {}
+    for path, image, digest, (page, x, y) in zip(sources, images, digests, placements):
+        # Max against the cleared page copies RGBA exactly, without blending
+        pages[page].blit(image, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        sprites[path] = {
+            "page": page,
+            "rect": [x, y, image.get_width(), image.get_height()],
+            "sha1": digest,
+        }
+
+    os.makedirs(output_dir, exist_ok=True)
+    page_names = []
+    for index, surface in enumerate(pages):
+        name = f"atlas_{index}.png"
+        pygame.image.save(surface, os.path.join(output_dir, name))
+        page_names.append(name)
+
+    manifest = {"pages": page_names, "sprites": sprites}
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+        file.write("\n")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Pack the game's sprites into texture atlas pages."
+    )
+    parser.add_argument("--output", default=OUTPUT_DIR)
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+
+    # Converting surfaces needs a display, a hidden one is enough
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    manifest = build(output_dir=args.output, page_size=args.page_size)
+    print(
+        f"Packed {len(manifest['sprites'])} sprites onto "
+        f"{len(manifest['pages'])} page(s) in {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import time
+import classes
+import headless
+import spawning
+from abilities import AutomaticCrossbow, ThrowingAxes
+
+# Result columns, one value per round in every column
+COLUMNS = (
+    "seed",
+    "params",
+    "outcome",
+    "survived_ms",
+    "ticks",
+    "kills",
+    "score",
+    "level",
+    "peak_enemies",
+    "level_times_ms",
+)
+
+# Tunables as the game ships them, restored before every round
+DEFAULTS = {
+    "timeline": spawning.TIMELINE,
+    "spawn_rate": spawning.RATE_SCALE,
+    "xp_exponent": classes.XP_EXPONENT,
+    "crossbow_cooldown": AutomaticCrossbow.COOLDOWN,
+    "axes_cooldown": ThrowingAxes.COOLDOWN,
+}
+
+
+def apply_params(params):
+    """Set the tunables of this process. Keys left out keep their defaults."""
+    unknown = set(params) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}.")
+    values = dict(DEFAULTS, **params)
+    spawning.TIMELINE = values["timeline"]
+    spawning.RATE_SCALE = values["spawn_rate"]
+    classes.XP_EXPONENT = values["xp_exponent"]
+    AutomaticCrossbow.COOLDOWN = values["crossbow_cooldown"]
+    ThrowingAxes.COOLDOWN = values["axes_cooldown"]
+
+
+class LevelCurve:
+    """Wraps a policy and notes the round time of every level-up."""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.level = 1
+        self.times_ms = []
+
+    def __call__(self, game_round):
+        level = game_round.player.level
+        while self.level < level:
+            self.level += 1
+            self.times_ms.append(game_round.elapsed_ms)
+        return self.policy(game_round)
+
+
+def run_round(task):
+    """Play one headless round in a worker process and return its row."""
+    index, seed, params, duration_ms = task
+    apply_params(params)
+    curve = LevelCurve(headless.OrbitBot())
+    summary = headless.run(policy=curve, seed=seed, duration_ms=duration_ms)
+    row = {name: summary.get(name) for name in COLUMNS}
+    row["params"] = params
+    row["level_times_ms"] = curve.times_ms
+    return index, row
+
+
+def parse_value(name, text):
+    """Read a --set value as the type of the parameter's default:
+    "1.5" -> 1.5 for numbers, text as it is for file paths."""
+    if isinstance(DEFAULTS[name], str):
+        return text
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    raise ValueError(f"{name} takes numbers, got {text!r}.")
+
+
+def parse_sweep(settings):
+    """Expand ["name=a,b", ...] into every combination of the values."""
+    names = []
+    choices = []
+    for setting in settings:
+        name, _, values = setting.partition("=")
+        if name not in DEFAULTS or not values:
+            raise ValueError(
+                f"Expected one of {', '.join(DEFAULTS)}=v1,v2..., got {setting!r}."
+            )
+        names.append(name)
+        choices.append([parse_value(name, value) for value in values.split(",")])
+    return [dict(zip(names, combo)) for combo in itertools.product(*choices)]
+
+
+def run_batch(param_sets, seeds, duration_ms, workers=None):
+    """Run every parameter set with every seed across a process pool.
+
+    Workers are started with the "spawn" method, so each one imports the
+    game and initializes pygame on its own. Returns the rows in task order.
+    """
+    tasks = [
+        (index, seed, params, duration_ms)
+        for index, (params, seed) in enumerate(itertools.product(param_sets, seeds))
+    ]
+    rows = [None] * len(tasks)
+    chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+    pool = multiprocessing.get_context("spawn").Pool(workers)
+    try:
+        for done, (index, row) in enumerate(
+            pool.imap_unordered(run_round, tasks, chunksize), 1
+        ):
+            rows[index] = row
+            print(f"\r{done}/{len(tasks)} rounds", end="", flush=True)
+    finally:
+        # SDL in the workers turns SIGTERM into a quit event, so the pool is
+        # closed and joined rather than terminated
+        pool.close()
+        pool.join()
+    print()
+    return rows
+
+
+def to_columns(rows):
+    return {name: [row[name] for row in rows] for name in COLUMNS}
+
+
+def summarize(rows):
+    """Mean survival, kills, level and peak enemies per parameter set."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(json.dumps(row["params"], sort_keys=True), []).append(row)
+    lines = []
+    for params, group in groups.items():
+        count = len(group)
+        lines.append(
+            f"{params}: {count} rounds, "
+            f"survived {sum(r['survived_ms'] for r in group) / count / 1000:.1f} s, "
+            f"kills {sum(r['kills'] for r in group) / count:.1f}, "
+            f"level {sum(r['level'] for r in group) / count:.2f}, "
+            f"peak enemies {sum(r['peak_enemies'] for r in group) / count:.1f}, "
+            f"wins {sum(r['outcome'] == 'WIN' for r in group)}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Run many headless Orc Slayer rounds in parallel."
+    )
+    parser.add_argument("--seeds", type=int, default=100, help="rounds per set")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="NAME=V1,V2",
+        help="sweep a parameter over a list of values",
+    )
+    parser.add_argument("--seconds", type=float, default=600)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="batch_results.json")
+    args = parser.parse_args()
+
+    try:
+        param_sets = parse_sweep(args.set)
+    except ValueError as error:
+        parser.error(str(error))
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    started = time.perf_counter()
+    rows = run_batch(param_sets, seeds, args.seconds * 1000, args.workers)
+    elapsed = time.perf_counter() - started
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {"defaults": DEFAULTS, "rounds": len(rows), "columns": to_columns(rows)},
+            file,
+        )
+    print(summarize(rows))
+    print(f"{len(rows)} rounds in {elapsed:.1f} s, results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Deterministic performance benchmarks for the PLAY loop.
+
+Run with ``python -m benchmarks`` from the repository root.
+"""
@@ -0,0 +1,110 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+import headless
+from benchmarks.scenes import Scene
+
+DEFAULT_COUNTS = [50, 100, 250, 500, 1000, 2500, 5000]
+PHASES = ("update", "collision", "draw")
+# Timings only compare on the machine that recorded them, so every
+# machine keeps its own baseline and git ignores it
+BASELINE_PATH = "benchmarks/baseline.local.json"
+
+# Phases faster than this are too noisy to judge against a baseline
+MIN_REGRESSION_MS = 0.1
+
+
+def bench(enemy_count, frames, warmup, seed):
+    scene = Scene(enemy_count, seed=seed)
+    samples = {phase: [] for phase in PHASES}
+    for frame in range(warmup + frames):
+        timings = {}
+        for phase in PHASES:
+            start = time.perf_counter()
+            getattr(scene, f"{phase}_phase")()
+            timings[phase] = (time.perf_counter() - start) * 1000
+        scene.end_frame()
+        if frame >= warmup:
+            for phase in PHASES:
+                samples[phase].append(timings[phase])
+    result = {"enemies": enemy_count}
+    for phase in PHASES:
+        result[f"{phase}_ms"] = round(statistics.median(samples[phase]), 4)
+    return result
+
+
+def find_regressions(results, baseline, tolerance):
+    by_count = {entry["enemies"]: entry for entry in baseline["results"]}
+    failures = []
+    for result in results:
+        expected = by_count.get(result["enemies"])
+        if expected is None:
+            continue
+        for phase in PHASES:
+            key = f"{phase}_ms"
+            limit = max(expected[key] * (1 + tolerance), MIN_REGRESSION_MS)
+            if result[key] > limit:
+                failures.append(
+                    f"{result['enemies']} enemies: {phase} took {result[key]:.3f} ms,"
+                    f" baseline {expected[key]:.3f} ms (limit {limit:.3f} ms)"
+                )
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Orc Slayer loop.")
+    parser.add_argument("--counts", type=int, nargs="+", default=DEFAULT_COUNTS)
+    parser.add_argument("--frames", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="Store these results as this machine's baseline instead of checking them.",
+    )
+    args = parser.parse_args()
+
+    headless.init_display()
+    results = []
+    for count in args.counts:
+        result = bench(count, args.frames, args.warmup, args.seed)
+        print(
+            f"{count:>5} enemies  "
+            + "  ".join(f"{phase} {result[f'{phase}_ms']:8.3f} ms" for phase in PHASES)
+        )
+        results.append(result)
+
+    report = {"frames": args.frames, "seed": args.seed, "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(
+            f"No baseline at {args.baseline}, skipping regression check. "
+            "Run with --update-baseline to record one for this machine."
+        )
+        return
+
+    failures = find_regressions(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
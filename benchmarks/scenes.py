@@ -0,0 +1,103 @@
+import random
+import rng
+import pygame
+import abilities
+import spawning
+import timing
+from abilities import AutomaticCrossbow, ThrowingAxes, WildFlail
+from classes import enemy_pools
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from inputs import Controls
+from simulation import Round
+
+# One elapsed time per spawn timeline segment, cycled while spawning
+TIER_SECONDS = (0, 200, 400, 560)
+
+# Enemies never die during a benchmark so every frame sees the same horde
+BENCH_HEALTH = 10**9
+
+
+class Scene:
+    """A Round populated with a fixed horde, every ability and live projectiles."""
+
+    def __init__(self, enemy_count, seed=0, projectiles_per_enemy=0.2):
+        rng.seed(seed)
+        self.rng = random.Random(seed)
+        self.clock = timing.FixedClock()
+        timing.use_clock(self.clock)
+
+        self.round = Round()
+        self.player = self.round.player
+        for ability in (AutomaticCrossbow, ThrowingAxes, WildFlail):
+            self.player.grant_ability(ability)
+
+        timeline = spawning.load_timeline()
+        draws = self.round.director.draws
+        for i in range(enemy_count):
+            segment = timeline.segment_at(TIER_SECONDS[i % len(TIER_SECONDS)] * 1000)
+            enemy_class = segment.table.choose(draws, 1)[0]
+            enemy = enemy_pools[enemy_class].acquire()
+            enemy.health = BENCH_HEALTH
+            enemy.pos = [
+                self.rng.uniform(0, SCREEN_WIDTH),
+                self.rng.uniform(0, SCREEN_HEIGHT),
+            ]
+            enemy.rect.center = (round(enemy.pos[0]), round(enemy.pos[1]))
+            enemy.hitbox.center = enemy.rect.center
+            self.round.add_enemies([enemy])
+
+        self.projectile_target = max(1, int(enemy_count * projectiles_per_enemy))
+        self.controls = Controls()
+        self.surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.refill_projectiles()
+
+    def refill_projectiles(self):
+        """Top bolts and axes back up to the target count."""
+        p = self.player
+        rng = self.rng
+        while len(p.bolts) < self.projectile_target:
+            p.bolts.append(
+                abilities.bolt_pool.acquire(
+                    rng.uniform(0, SCREEN_WIDTH),
+                    rng.uniform(0, SCREEN_HEIGHT),
+                    rng.uniform(0, SCREEN_WIDTH),
+                    rng.uniform(0, SCREEN_HEIGHT),
+                )
+            )
+        while len(p.axes) < self.projectile_target:
+            p.axes.append(
+                abilities.axe_pool.acquire(
+                    rng.uniform(0, SCREEN_WIDTH),
+                    rng.uniform(0, SCREEN_HEIGHT),
+                    rng.choice(["up", "down"]),
+                )
+            )
+
+    def update_phase(self):
+        """Enemy movement, ability cooldowns and firing, player animation."""
+        game_round = self.round
+        args = (self.clock.get_ticks(), self.controls, timing.FIXED_DT)
+        game_round.move_enemies(*args)
+        game_round.fire_abilities(*args)
+        self.player.current_anim.update()
+
+    def collision_phase(self):
+        """Grid rebuild, projectile hits, contact damage and the melee arc."""
+        game_round = self.round
+        p = self.player
+        grid = game_round.enemy_grid
+        args = (self.clock.get_ticks(), self.controls, timing.FIXED_DT)
+        game_round.index_enemies(*args)
+        game_round.move_projectiles(*args)
+        grid.query_rect(p.hitbox)
+        grid.query_rect(p.attack_hitbox)
+        for o in game_round.objects:
+            o.hitbox.center = o.rect.center
+
+    def draw_phase(self):
+        self.round.draw(self.surface, self.background)
+
+    def end_frame(self):
+        self.clock.advance()
+        self.refill_projectiles()
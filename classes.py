@@ -1,38 +1,42 @@
 import pygame
 import math
-import os
-import random
+import rng
 import animation
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT, SPRITE_HEIGHT, SPRITE_WIDTH
+import assets
+import events
+import hits
+import pooling
+import timing
+from inputs import Controls
+from render import interpolate_rect
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from functions import new_ability
 
+# XP needed for the next level is level ** XP_EXPONENT
+XP_EXPONENT = 1.5
+
 
 class Player:
     def __init__(self, image, speed, health, max_health):
+        # Pixels per second
         self.speed = speed
         self.image = image
         self.flip_image = pygame.transform.flip(image, True, False)
-        self.pos = image.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.pos = image.get_rect()
         self.hitbox = (image.get_rect()).scale_by(0.35, 0.55)
-        self.health = health
-        self.score = 0
-        self.max_health = max_health
-        self.arc_active = False
-        self.arc_start_time = 0
+        # Health every run starts with
+        self.start_health = health
+        self.start_max_health = max_health
         self.arc_duration = 300
         self.arc_color = (255, 255, 255)
-        self.hit_enemies = []
         self.attack_hitbox = pygame.Rect(0, 0, 80, 60)
+        # Enemies the current swing has hit
+        self.swing = hits.Swing()
         # slash animation
-        self.slash_sheet = pygame.image.load(
-            "./assets/animations/slash/slash2_128x128.png"
-        ).convert_alpha()
-        self.slash_frames = 9
-        self.slash_w = 128
-        self.slash_h = 128
-        self.slash_index = 0
-        self.slash_active = False
-        self.slash_start = 0
+        self.slash_sheet = animation.SpriteSheet(
+            "./assets/animations/slash/slash2_128x128.png", frame_count=9
+        )
+        self.slash_frames = self.slash_sheet.frame_count
         self.slash_duration = 270
         # Load 128x128 sprite sheets
         self.idle_sheet = animation.SpriteSheet(
@@ -50,44 +54,63 @@ class Player:
             "walk": animation.get_center_offset(self.walk_sheet),
             "attack": animation.get_center_offset(self.attack_sheet),
         }
+        self.flipped_offsets = {
+            state: (self.idle_sheet.frame_width - offset_x, offset_y)
+            for state, (offset_x, offset_y) in self.offsets.items()
+        }
         # Create animations
         self.animations = {
             "idle": animation.Animation(self.idle_sheet, base_fps=8),
             "walk": animation.Animation(self.walk_sheet, base_fps=12),
             "attack": animation.Animation(self.attack_sheet, base_fps=15, loop=False),
         }
+        # Obtained abilities and their live projectiles
+        self.abilities = []
+        self.bolts = []
+        self.axes = []
+        self.flails = []
+        self.reset()
+
+    def reset(self):
+        """Restore the state a run starts with. Sheets, offsets and
+        animations are kept. Live projectiles must already be back in their
+        pools."""
+        self.pos.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+        self.prev_center = self.pos.center
+        self.hitbox.center = self.pos.center
+        self.health = self.start_health
+        self.max_health = self.start_max_health
+        self.score = 0
+        self.arc_active = False
+        self.arc_start_time = 0
+        self.swing.start()
+        self.slash_index = 0
+        self.slash_active = False
+        self.slash_start = 0
         # Current state
         self.state = "idle"
         self.facing = "right"
         self.current_anim = self.animations["idle"]
+        for anim in self.animations.values():
+            anim.reset()
         self.is_attacking = False
         # Level tracking
         self.level = 1
         self.current_xp = 0
         self.max_xp = 0
-        # Obtained abilities
-        self.abilities = []
-        self.bolts = []
-        self.axes = []
-        self.flails = []
+        self.abilities.clear()
+        self.bolts.clear()
+        self.axes.clear()
+        self.flails.clear()
 
     def get_xp_needed(self):
-        return int(self.level**1.5)
+        return int(self.level**XP_EXPONENT)
 
     def get_xp(self, enemy):
         if enemy.health <= 0:
-            if type(enemy) is EasyEnemy:
-                self.score += 1
-                self.current_xp += 1
-            if type(enemy) is MediumEnemy:
-                self.score += 3
-                self.current_xp += 3
-            if type(enemy) is HardEnemy:
-                self.score += 5
-                self.current_xp += 5
-            if type(enemy) is SpecialEnemy:
-                self.score += 10
-                self.current_xp += 10
+            archetype = enemy.archetype
+            self.score += archetype.score
+            self.current_xp += archetype.xp
 
             xp_needed = self.get_xp_needed()
             while self.current_xp >= xp_needed:
@@ -99,45 +122,31 @@ class Player:
 
             return True
 
-    def move(self, up=False, down=False, left=False, right=False):
-        if right:
-            self.pos.right += self.speed
-        if left:
-            self.pos.right -= self.speed
-        if down:
-            self.pos.top += self.speed
-        if up:
-            self.pos.top -= self.speed
-        if self.pos.right > SCREEN_WIDTH:
-            self.pos.left = 0
-        if self.pos.top > SCREEN_HEIGHT - SPRITE_HEIGHT:
-            self.pos.top = 0
-        if self.pos.right < SPRITE_WIDTH:
-            self.pos.right = SCREEN_WIDTH
-        if self.pos.top < 0:
-            self.pos.top = SCREEN_HEIGHT - SPRITE_HEIGHT
-
     def take_damage(self, damage=1):
         if self.health > 0:
             self.health -= damage
 
-    def basic_attack(self, surface):
+    def basic_attack(self, surface=None):
         if not self.arc_active:
             self.arc_active = True
-            self.arc_start_time = pygame.time.get_ticks()
-            self.hit_enemies = []
+            self.arc_start_time = timing.get_ticks()
+            self.swing.start()
 
-        self.draw_arc(surface)
+        if surface is not None:
+            self.draw_arc(surface)
 
-    def draw_arc(self, surface):
+    def draw_arc(self, surface, alpha=1.0):
         offset = 0
         radius = 50
-        if self.image == self.flip_image:
-            center = (self.pos.centerx - offset, self.pos.centery)
+        shift_x, shift_y = self.render_offset(alpha)
+        x, y = self.pos.centerx + shift_x, self.pos.centery + shift_y
+        # Opens toward the side the player faces, like the attack hitbox
+        if self.facing == "left":
+            center = (x - offset, y)
             start_angle = math.pi / 2
             end_angle = -math.pi / 2
         else:
-            center = (self.pos.centerx + offset, self.pos.centery)
+            center = (x + offset, y)
             start_angle = -math.pi / 2
             end_angle = math.pi / 2
         return pygame.draw.arc(
@@ -153,23 +162,28 @@ class Player:
         """Call this when the player presses Space."""
         if not self.slash_active:
             self.slash_active = True
-            self.slash_start = pygame.time.get_ticks()
+            self.slash_start = timing.get_ticks()
             self.slash_index = 0
-            self.hit_enemies = []
-
-    def update(self, enemies):
-        current_time = pygame.time.get_ticks()
-        keys = pygame.key.get_pressed()
+            self.swing.start()
+
+    def update(self, controls=None, dt=timing.FIXED_DT):
+        """Movement, facing, attack state and animations. Projectiles are
+        stepped by the round's projectile system."""
+        current_time = timing.get_ticks()
+        if controls is None:
+            controls = Controls.from_keyboard()
+        self.prev_center = self.pos.center
+        step = self.speed * dt
         dx = dy = 0
         # WASD movement
-        if keys[pygame.K_w]:
-            dy -= self.speed
-        if keys[pygame.K_s]:
-            dy += self.speed
-        if keys[pygame.K_a]:
-            dx -= self.speed
-        if keys[pygame.K_d]:
-            dx += self.speed
+        if controls.up:
+            dy -= step
+        if controls.down:
+            dy += step
+        if controls.left:
+            dx -= step
+        if controls.right:
+            dx += step
 
         moving = dx != 0 or dy != 0
 
@@ -192,10 +206,10 @@ class Player:
         )
 
         # Attack trigger
-        if keys[pygame.K_SPACE] and not self.is_attacking:
+        if controls.attack and not self.is_attacking:
             self.set_state("attack")
             self.is_attacking = True
-        elif not keys[pygame.K_SPACE]:
+        elif not controls.attack:
             self.is_attacking = False
 
         # Switch after attack finishes
@@ -231,15 +245,7 @@ class Player:
 
             if current_time - self.arc_start_time > self.arc_duration:
                 self.arc_active = False
-                self.hit_enemies = []
-        # Update all bolts
-        self.bolts = [bolt for bolt in self.bolts if not bolt.update(enemies)]
-        # Update all axes
-        self.axes = [axe for axe in self.axes if not axe.update(enemies)]
-        # Update flail
-        self.flails = [
-            flail for flail in self.flails if not flail.update(self, enemies)
-        ]
+                self.swing.start()
 
     def set_state(self, new_state):
         if self.state != new_state:
@@ -247,22 +253,34 @@ class Player:
             self.current_anim = self.animations[new_state]
             self.current_anim.reset()
 
-    def draw(self, surface):
-        anim = self.current_anim
-        frame = anim.sprite_sheet.frames[anim.current_frame]
+    def render_offset(self, alpha=1.0):
+        """Screen offset from pos to where the player is drawn, between the
+        last two simulation steps."""
+        if alpha >= 1.0:
+            return 0, 0
+        back = 1.0 - alpha
+        return (
+            round((self.prev_center[0] - self.pos.centerx) * back),
+            round((self.prev_center[1] - self.pos.centery) * back),
+        )
 
-        offset_x, offset_y = self.offsets[self.state]
+    def draw(self, surface, alpha=1.0):
+        anim = self.current_anim
 
-        # Flip if facing left
+        # Mirrored frames and offsets are precomputed by the sprite sheet
         if self.facing == "left":
-            frame = pygame.transform.flip(frame, True, False)
-            offset_x = 128 - offset_x
+            frame = anim.sprite_sheet.flipped_frames[anim.current_frame]
+            offset_x, offset_y = self.flipped_offsets[self.state]
+        else:
+            frame = anim.sprite_sheet.frames[anim.current_frame]
+            offset_x, offset_y = self.offsets[self.state]
 
-        draw_x = int(self.pos.centerx - offset_x)
-        draw_y = int(self.pos.centery - offset_y)
+        shift_x, shift_y = self.render_offset(alpha)
+        draw_x = int(self.pos.centerx - offset_x) + shift_x
+        draw_y = int(self.pos.centery - offset_y) + shift_y
 
         # Draw centered
-        surface.blit(frame, (draw_x, draw_y))
+        return surface.blit(frame, (draw_x, draw_y))
 
     def grant_ability(self, ability_class):
         new_ability = ability_class()
@@ -271,92 +289,254 @@ class Player:
         self.abilities.append(new_ability)
 
 
-class Enemy:
-    def __init__(self, image, speed, health):
-        self.image = image
-        self.speed = speed
+class EnemyArchetype:
+    """Stats and sprite variants shared by every enemy of one type."""
+
+    __slots__ = (
+        "name",
+        "health",
+        "speed",
+        "xp",
+        "score",
+        "contact_damage",
+        "hitbox_scale",
+        "sprite_paths",
+        "_sprites",
+    )
+
+    def __init__(
+        self,
+        name,
+        health,
+        speed,
+        xp,
+        score,
+        contact_damage,
+        sprite_paths,
+        hitbox_scale=(0.55, 0.75),
+    ):
+        self.name = name
         self.health = health
+        # Pixels per second
+        self.speed = speed
+        self.xp = xp
+        self.score = score
+        self.contact_damage = contact_damage
+        self.hitbox_scale = hitbox_scale
+        self.sprite_paths = sprite_paths
+        self._sprites = None
+
+    @property
+    def sprites(self):
+        # Loaded on first use, the display must exist before converting
+        if self._sprites is None:
+            self._sprites = [assets.load_image(path) for path in self.sprite_paths]
+        return self._sprites
+
+
+ENEMY_SPRITES = "./assets/images/enemies/"
+
+ARCHETYPES = {
+    "easy": EnemyArchetype(
+        "easy",
+        health=4,
+        speed=120.0,
+        xp=1,
+        score=1,
+        contact_damage=1,
+        sprite_paths=(
+            ENEMY_SPRITES + "easy/orc_B3.png",
+            ENEMY_SPRITES + "easy/orc_a1.png",
+        ),
+    ),
+    "medium": EnemyArchetype(
+        "medium",
+        health=8,
+        speed=60.0,
+        xp=3,
+        score=3,
+        contact_damage=1,
+        sprite_paths=(
+            ENEMY_SPRITES + "medium/orc_a3.png",
+            ENEMY_SPRITES + "medium/orc_a6.png",
+        ),
+    ),
+    "hard": EnemyArchetype(
+        "hard",
+        health=20,
+        speed=30.0,
+        xp=5,
+        score=5,
+        contact_damage=1,
+        sprite_paths=(
+            ENEMY_SPRITES + "hard/orc_a8.png",
+            ENEMY_SPRITES + "hard/orc_a9.png",
+        ),
+    ),
+    "special": EnemyArchetype(
+        "special",
+        health=30,
+        speed=150.0,
+        xp=10,
+        score=10,
+        contact_damage=5,
+        sprite_paths=(ENEMY_SPRITES + "special/orc_B8.png",),
+    ),
+}
+
+
+class Enemy:
+    """One enemy on the field. Everything shared between enemies of a type
+    lives on the class-level archetype, the instance only holds state."""
+
+    __slots__ = (
+        "image",
+        "rect",
+        "hitbox",
+        "_pos",
+        "_prev_pos",
+        "_health",
+        "swarm",
+        "slot",
+        "index",
+    )
+
+    archetype = None
+
+    def __init__(self):
+        # Set while the enemy belongs to a swarm.Swarm, which then owns pos/health
+        self.swarm = None
+        self.slot = -1
+        # Position in Round.objects while on the field
+        self.index = -1
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        self.hitbox = pygame.Rect(0, 0, 0, 0)
+        self.reset()
+
+    def reset(self):
+        """Restore spawn state so a pooled enemy can be reused."""
+        self.health = self.archetype.health
+        self.image = self.get_random_sprite()
         self.pos = [0.0, 0.0]
-        self.rect = self.image.get_rect()
+        self.prev_pos = (0.0, 0.0)
+        self.fit_rects()
+
+    @property
+    def speed(self):
+        return self.archetype.speed
+
+    @property
+    def pos(self):
+        if self.swarm is not None:
+            return self.swarm.pos[self.slot]
+        return self._pos
+
+    @pos.setter
+    def pos(self, value):
+        if self.swarm is not None:
+            self.swarm.pos[self.slot] = value
+        else:
+            self._pos = value
+
+    @property
+    def prev_pos(self):
+        """Position before the last movement step, for interpolated drawing."""
+        if self.swarm is not None:
+            return self.swarm.prev_pos[self.slot]
+        return self._prev_pos
+
+    @prev_pos.setter
+    def prev_pos(self, value):
+        if self.swarm is not None:
+            self.swarm.prev_pos[self.slot] = value
+        else:
+            self._prev_pos = value
+
+    @property
+    def health(self):
+        if self.swarm is not None:
+            return self.swarm.health[self.slot]
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        if self.swarm is not None:
+            self.swarm.health[self.slot] = value
+        else:
+            self._health = value
+
+    def attach(self, swarm, slot):
+        self.swarm = swarm
+        self.slot = slot
+
+    def detach(self):
+        """Copy swarm-owned state back onto the instance."""
+        swarm, slot = self.swarm, self.slot
+        self.swarm = None
+        self.slot = -1
+        self._pos = [float(swarm.pos[slot, 0]), float(swarm.pos[slot, 1])]
+        self._prev_pos = (
+            float(swarm.prev_pos[slot, 0]),
+            float(swarm.prev_pos[slot, 1]),
+        )
+        self._health = float(swarm.health[slot])
 
-    def get_random_sprite(self):
-        raise NotImplementedError("Children contain implementations")
+    def fit_rects(self):
+        """Size rect and hitbox to the image, reusing the existing Rects."""
+        self.rect.update(self.image.get_rect())
+        self.hitbox.update(self.rect.scale_by(*self.archetype.hitbox_scale))
 
-    def move_toward(self, target):
-        dx = target[0] - self.pos[0]
-        dy = target[1] - self.pos[1]
+    def get_random_sprite(self):
+        sprites = self.archetype.sprites
+        if len(sprites) == 1:
+            return sprites[0]
+        return sprites[rng.stream("cosmetic").randrange(0, len(sprites))]
+
+    def move_toward(self, target, dt=timing.FIXED_DT):
+        pos = self.pos
+        self.prev_pos = (pos[0], pos[1])
+        dx = target[0] - pos[0]
+        dy = target[1] - pos[1]
         distance = math.hypot(dx, dy)
         if distance > 0:
-            self.pos[0] += (dx / distance) * self.speed
-            self.pos[1] += (dy / distance) * self.speed
-        self.rect.center = (round(self.pos[0]), round(self.pos[1]))
+            step = self.speed * dt
+            pos[0] += (dx / distance) * step
+            pos[1] += (dy / distance) * step
+        self.rect.center = (round(pos[0]), round(pos[1]))
+
+    def draw(self, surface, alpha=1.0):
+        return surface.blit(
+            self.image, interpolate_rect(self.rect, self.prev_pos, alpha)
+        )
 
     def take_damage(self, damage=2):
         if self.health > 0:
             self.health -= damage
+            if self.health <= 0:
+                events.deaths.emit(self)
 
 
 class EasyEnemy(Enemy):
-    def __init__(self):
-        self.health = 4
-        self.speed = 2.0
-        self.image = pygame.image.load(self.get_random_sprite()).convert_alpha()
-        self.pos = [0.0, 0.0]
-        self.rect = self.image.get_rect()
-        self.hitbox = (self.image.get_rect()).scale_by(0.55, 0.75)
-
-    def get_random_sprite(self):
-        path_to_sprite = os.path.abspath("assets/images/enemies/easy/")
-        sprites = []
-        for entry in os.listdir(path_to_sprite):
-            full_path = os.path.join(path_to_sprite, entry)
-            sprites.append(full_path)
-        return sprites[random.randrange(0, 2)]
+    __slots__ = ()
+    archetype = ARCHETYPES["easy"]
 
 
 class MediumEnemy(Enemy):
-    def __init__(self):
-        self.health = 8
-        self.speed = 1.0
-        self.image = pygame.image.load(self.get_random_sprite()).convert_alpha()
-        self.pos = [0.0, 0.0]
-        self.rect = self.image.get_rect()
-        self.hitbox = (self.image.get_rect()).scale_by(0.55, 0.75)
-
-    def get_random_sprite(self):
-        path_to_sprite = os.path.abspath("assets/images/enemies/medium/")
-        sprites = []
-        for entry in os.listdir(path_to_sprite):
-            full_path = os.path.join(path_to_sprite, entry)
-            sprites.append(full_path)
-        return sprites[random.randrange(0, 2)]
+    __slots__ = ()
+    archetype = ARCHETYPES["medium"]
 
 
 class HardEnemy(Enemy):
-    def __init__(self):
-        self.health = 20
-        self.speed = 0.5
-        self.image = pygame.image.load(self.get_random_sprite()).convert_alpha()
-        self.pos = [0.0, 0.0]
-        self.rect = self.image.get_rect()
-        self.hitbox = (self.image.get_rect()).scale_by(0.55, 0.75)
-
-    def get_random_sprite(self):
-        path_to_sprite = os.path.abspath("assets/images/enemies/hard/")
-        sprites = []
-        for entry in os.listdir(path_to_sprite):
-            full_path = os.path.join(path_to_sprite, entry)
-            sprites.append(full_path)
-        return sprites[random.randrange(0, 2)]
+    __slots__ = ()
+    archetype = ARCHETYPES["hard"]
 
 
 class SpecialEnemy(Enemy):
-    def __init__(self):
-        self.health = 30
-        self.speed = 2.5
-        self.image = pygame.image.load(
-            "./assets/images/enemies/special/orc_B8.png"
-        ).convert_alpha()
-        self.pos = [0.0, 0.0]
-        self.rect = self.image.get_rect()
-        self.hitbox = (self.image.get_rect()).scale_by(0.55, 0.75)
+    __slots__ = ()
+    archetype = ARCHETYPES["special"]
+
+
+# Recycled enemies, one pool per enemy type
+enemy_pools = {
+    cls: pooling.Pool(cls) for cls in (EasyEnemy, MediumEnemy, HardEnemy, SpecialEnemy)
+}
@@ -3,3 +3,22 @@ SCREEN_HEIGHT = 720
 
 SPRITE_HEIGHT = 10
 SPRITE_WIDTH = 3
+
+# Move enemies with the NumPy swarm backend when numpy is installed
+USE_SWARM = True
+
+# Crowd separation in the swarm backend: enemies closer than the radius
+# (px) push apart at up to the strength (px/s); 0 turns it off
+SEPARATION_RADIUS = 40.0
+SEPARATION_STRENGTH = 200.0
+# Most neighbour pairs checked per tick, whatever the crowd size
+SEPARATION_BUDGET = 20_000
+
+# Render frame rate cap; the simulation itself always steps at 60 Hz
+FPS_CAP = 120
+# Longest frame fed to the simulation, so a stall does not trigger a
+# burst of catch-up steps
+MAX_FRAME_MS = 250
+
+# Redraw only changed screen regions; False falls back to full-frame redraws
+DIRTY_RECTS = True
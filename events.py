@@ -0,0 +1,29 @@
+from collections import deque
+
+
+class EventQueue:
+    """First-in first-out events, emitted by gameplay code during a tick
+    and drained by the system that handles them."""
+
+    def __init__(self):
+        self.items = deque()
+
+    def __len__(self):
+        return len(self.items)
+
+    def emit(self, event):
+        self.items.append(event)
+
+    def drain(self):
+        """Yield and remove events until the queue is empty, including any
+        emitted while draining."""
+        items = self.items
+        while items:
+            yield items.popleft()
+
+    def clear(self):
+        self.items.clear()
+
+
+# Enemies whose health just reached zero, in the order they died
+deaths = EventQueue()
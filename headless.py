@@ -0,0 +1,255 @@
+import argparse
+import os
+import json
+import math
+import sys
+import time
+import pygame
+import rng
+import timing
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from inputs import Controls
+from simulation import ROUND_DURATION_MS, Round
+
+TICK_MS = timing.STEP_MS
+
+
+class KitingBot:
+    """Scripted policy: backs away from nearby enemies and swings at the
+    closest one whenever the player already faces it."""
+
+    def __init__(self, danger_radius=220, attack_radius=150):
+        self.danger_radius = danger_radius
+        self.attack_radius = attack_radius
+
+    def __call__(self, game_round):
+        p = game_round.player
+        x, y = p.pos.center
+        push_x = push_y = 0.0
+        nearest = None
+        for enemy, distance in game_round.enemy_grid.within(x, y, self.danger_radius):
+            if nearest is None:
+                nearest = (enemy, distance)
+            weight = 1 / max(distance, 1)
+            push_x += (x - enemy.rect.centerx) * weight
+            push_y += (y - enemy.rect.centery) * weight
+
+        # Drift back toward the middle so the bot does not pin itself on a wall
+        push_x += (SCREEN_WIDTH / 2 - x) * 0.002
+        push_y += (SCREEN_HEIGHT / 2 - y) * 0.002
+
+        attack = False
+        if nearest is not None and nearest[1] <= self.attack_radius:
+            enemy_right = nearest[0].rect.centerx >= x
+            attack = enemy_right == (p.facing == "right")
+        return Controls(
+            up=push_y < -0.1,
+            down=push_y > 0.1,
+            left=push_x < -0.1,
+            right=push_x > 0.1,
+            attack=attack,
+            attack_pressed=attack,
+        )
+
+
+class OrbitBot:
+    """Scripted policy that lasts into the late waves: circles the arena
+    on an ellipse so chasers trail behind, lets the nearest one close to
+    `hold`, and turns toward it to swing on the way past. Keeps clear of
+    walls and hard hitters, and detours for food when hurt."""
+
+    def __init__(
+        self, orbit=(400, 170), hold=120, reach=150, band=55, repel=160, hungry=5
+    ):
+        self.orbit = orbit
+        self.hold = hold
+        self.reach = reach
+        self.band = band
+        self.repel = repel
+        self.hungry = hungry
+
+    def __call__(self, game_round):
+        p = game_round.player
+        x, y = p.pos.center
+
+        # Counterclockwise along the ellipse, steering back onto it
+        a, b = self.orbit
+        u = (x - SCREEN_WIDTH / 2) / a
+        v = (y - SCREEN_HEIGHT / 2) / b
+        r = math.hypot(u, v) or 1e-6
+        tangent = math.hypot(v * a, u * b) or 1e-6
+        move_x = -v * a / tangent + u / r * (1 - r) * 3
+        move_y = u * b / tangent + v / r * (1 - r) * 3
+
+        target = nearest = None
+        for enemy, distance in game_round.enemy_grid.within(x, y, 400):
+            # Enemies that hit harder count as closer
+            distance /= enemy.archetype.contact_damage**0.5
+            if nearest is None or distance < nearest:
+                nearest = distance
+            dx = enemy.rect.centerx - x
+            dy = enemy.rect.centery - y
+            # Only enemies level with the player fit in the swing
+            if target is None and 25 <= abs(dx) <= self.reach and abs(dy) < self.band:
+                target = dx
+            if distance < self.repel:
+                weight = 2 * (self.repel - distance) / self.repel / max(distance, 1)
+                move_x -= dx * weight
+                move_y -= dy * weight
+
+        margin = 140
+        move_x += 3 * (max(0, margin - x) - max(0, x - SCREEN_WIDTH + margin)) / margin
+        move_y += 3 * (max(0, margin - y) - max(0, y - SCREEN_HEIGHT + margin)) / margin
+
+        hungry = p.max_health - p.health >= self.hungry and game_round.food_objects
+        if hungry:
+            food = min(
+                game_round.food_objects,
+                key=lambda food: math.dist(food.food_rect.center, (x, y)),
+            )
+            to_x = food.food_rect.centerx - x
+            to_y = food.food_rect.centery - y
+            distance = math.hypot(to_x, to_y) or 1
+            move_x += to_x / distance * 1.5
+            move_y += to_y / distance * 1.5
+
+        # Keys for the direction, within 22.5 degrees of it
+        threshold = math.hypot(move_x, move_y) * 0.38
+        step_x = (move_x > threshold) - (move_x < -threshold)
+        step_y = (move_y > threshold) - (move_y < -threshold)
+        if nearest is not None and nearest > self.hold and not hungry:
+            step_x = step_y = 0
+
+        # Face the target on the tick of the swing so the arc opens toward it
+        attack = target is not None and game_round.attack_cooldown <= 0
+        if attack:
+            step_x = 1 if target > 0 else -1
+        return Controls(
+            up=step_y < 0,
+            down=step_y > 0,
+            left=step_x < 0,
+            right=step_x > 0,
+            attack=attack,
+            attack_pressed=attack,
+        )
+
+
+def init_display():
+    """Set up SDL's dummy video driver so surfaces can be converted and
+    text rendered without a window."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    if pygame.display.get_surface() is None:
+        pygame.display.set_mode((1, 1))
+
+
+def run(
+    policy=None,
+    seed=None,
+    duration_ms=ROUND_DURATION_MS,
+    tick_ms=TICK_MS,
+    disable=(),
+    replay=None,
+    game_round=None,
+):
+    """Play one round without rendering, as fast as the CPU allows.
+
+    The round runs on a FixedClock that advances tick_ms per tick, and
+    each tick simulates tick_ms of gameplay, so the outcome depends only
+    on the seed and the policy. Systems named in `disable` are switched
+    off for the run. A replay.Replay passed as `replay` records the input
+    of every tick. A Round passed as `game_round` is reset and reused,
+    like a restart in the game. Returns the round summary with the seed
+    and outcome added.
+    """
+    init_display()
+    seed = rng.seed(seed)
+    if policy is None:
+        policy = KitingBot()
+
+    clock = timing.FixedClock(step_ms=tick_ms)
+    dt = tick_ms / 1000
+    previous_clock = timing.clock
+    timing.use_clock(clock)
+    try:
+        if game_round is None:
+            game_round = Round()
+        else:
+            game_round.reset()
+        game_round.systems.disable(*disable)
+        outcome = None
+        while outcome is None and clock.now <= duration_ms:
+            controls = policy(game_round)
+            if replay is not None:
+                replay.record(controls)
+            outcome = game_round.update(clock.get_ticks(), controls, dt)
+            clock.advance()
+    finally:
+        timing.use_clock(previous_clock)
+
+    summary = game_round.summary()
+    summary["seed"] = seed
+    summary["outcome"] = outcome.name if outcome is not None else "TIMEOUT"
+    return summary
+
+
+def check_restart(seed, duration_ms=ROUND_DURATION_MS):
+    """Play `seed` in a fresh round and in a round restarted after another
+    run. Returns both summaries, which must match for replays recorded
+    after a restart to play back."""
+    init_display()
+    fresh = run(seed=seed, duration_ms=duration_ms)
+    game_round = Round()
+    run(seed=seed + 1, duration_ms=duration_ms, game_round=game_round)
+    restarted = run(seed=seed, duration_ms=duration_ms, game_round=game_round)
+    return fresh, restarted
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Orc Slayer rounds headless.")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=ROUND_DURATION_MS / 1000)
+    parser.add_argument(
+        "--disable",
+        nargs="*",
+        default=[],
+        metavar="SYSTEM",
+        help="gameplay systems to switch off, e.g. pickups",
+    )
+    parser.add_argument("--record", metavar="PATH", help="save a replay of the round")
+    parser.add_argument(
+        "--check-restart",
+        action="store_true",
+        help="fail unless a restarted round plays the seed like a fresh one",
+    )
+    args = parser.parse_args()
+
+    if args.check_restart:
+        seed = 0 if args.seed is None else args.seed
+        fresh, restarted = check_restart(seed, args.seconds * 1000)
+        print(json.dumps({"fresh": fresh, "restarted": restarted}, indent=2))
+        if fresh != restarted:
+            sys.exit("A restarted round played differently from a fresh one.")
+        return
+
+    # replay imports this module for init_display
+    from replay import Replay
+
+    seed = rng.seed(args.seed)
+    recording = Replay(seed) if args.record else None
+    started = time.perf_counter()
+    summary = run(
+        seed=seed,
+        duration_ms=args.seconds * 1000,
+        disable=args.disable,
+        replay=recording,
+    )
+    summary["wall_seconds"] = round(time.perf_counter() - started, 3)
+    if recording is not None:
+        recording.save(args.record)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
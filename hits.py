@@ -0,0 +1,26 @@
+class Swing:
+    """The enemies one attack has already hit, so it hits each only once.
+
+    A melee swing, or a piercing projectile that passes through several
+    enemies, owns a Swing and calls start() when a new attack begins.
+    Hits are kept in an identity set, so the check stays O(1) in a dense
+    crowd, and attacks that overlap in time each keep their own record.
+    """
+
+    __slots__ = ("hit",)
+
+    def __init__(self):
+        self.hit = set()
+
+    def __len__(self):
+        return len(self.hit)
+
+    def start(self):
+        self.hit.clear()
+
+    def first_hit(self, enemy):
+        """True the first time `enemy` is hit during this attack."""
+        if enemy in self.hit:
+            return False
+        self.hit.add(enemy)
+        return True
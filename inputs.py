@@ -0,0 +1,53 @@
+import pygame
+
+# Bit of each control in a packed input mask, as stored in replays
+MASK_BITS = ("up", "down", "left", "right", "attack", "attack_pressed")
+
+
+class Controls:
+    """Player input for one tick, read from the keyboard or scripted."""
+
+    def __init__(
+        self,
+        up=False,
+        down=False,
+        left=False,
+        right=False,
+        attack=False,
+        attack_pressed=False,
+    ):
+        self.up = up
+        self.down = down
+        self.left = left
+        self.right = right
+        # attack is held Space, attack_pressed is a fresh Space key press
+        self.attack = attack
+        self.attack_pressed = attack_pressed
+
+    def to_mask(self):
+        mask = 0
+        for bit, name in enumerate(MASK_BITS):
+            if getattr(self, name):
+                mask |= 1 << bit
+        return mask
+
+    @classmethod
+    def from_mask(cls, mask):
+        return cls(
+            **{name: bool(mask >> bit & 1) for bit, name in enumerate(MASK_BITS)}
+        )
+
+    @classmethod
+    def from_keyboard(cls, events=()):
+        keys = pygame.key.get_pressed()
+        return cls(
+            up=keys[pygame.K_w],
+            down=keys[pygame.K_s],
+            left=keys[pygame.K_a],
+            right=keys[pygame.K_d],
+            attack=keys[pygame.K_SPACE],
+            attack_pressed=any(
+                event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE
+                for event in events
+            ),
+        )
@@ -1,15 +1,21 @@
-import pygame
-import random
+import rng
+import assets
+import pooling
 from constants import SCREEN_HEIGHT, SCREEN_WIDTH
 
 
 class Food:
     def __init__(self):
-        self.image = pygame.image.load(
-            "./assets/images/items/81_pizza.png"
-        ).convert_alpha()
-        self.food_rect = self.image.get_rect().move(
-            random.randint(0, SCREEN_WIDTH - 20), random.randint(0, SCREEN_HEIGHT - 20)
+        self.image = assets.load_image("./assets/images/items/81_pizza.png")
+        self.food_rect = self.image.get_rect()
+        self.reset()
+
+    def reset(self):
+        self.food_rect.size = self.image.get_size()
+        loot = rng.stream("loot")
+        self.food_rect.topleft = (
+            loot.randint(0, SCREEN_WIDTH - 20),
+            loot.randint(0, SCREEN_HEIGHT - 20),
         )
         self.health_amount = 5
 
@@ -20,3 +26,7 @@ class Food:
 
         else:
             player.health += self.health_amount
+
+
+# Recycled food pickups
+food_pool = pooling.Pool(Food)
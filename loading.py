@@ -0,0 +1,135 @@
+import io
+import queue
+import threading
+import time
+import pygame
+import assets
+
+# Decoded before the title screen needs them, in this order
+BACKGROUNDS = (
+    "./assets/images/backgrounds/menu_screen.png",
+    "./assets/images/backgrounds/dungeon_brick_wall_blue.png",
+    "./assets/images/backgrounds/death_screen.png",
+    "./assets/images/backgrounds/victory_screen.png",
+)
+# Sprites a round needs straight away, when they are not in the atlas
+SPRITES = (
+    "./assets/images/player.png",
+    "./assets/animations/player/Idle.png",
+    "./assets/animations/player/Walk.png",
+    "./assets/animations/player/Attack_1.png",
+    "./assets/animations/slash/slash2_128x128.png",
+)
+
+
+def startup_assets(registry=assets.registry):
+    """(path, alpha) of every image to preload: the backgrounds, then the
+    atlas pages, or the loose sprites when there is no atlas."""
+    items = [(path, False) for path in BACKGROUNDS]
+    pages = registry.page_paths()
+    items.extend((path, True) for path in (pages or SPRITES))
+    return items
+
+
+class Preloader:
+    """Reads and decodes images on a worker thread.
+
+    Converting a surface to the display format has to happen on the main
+    thread, so poll() finishes the decoded images there, a few at a time,
+    and installs them in the asset registry. Per-asset read, decode and
+    convert times are kept for the startup report.
+    """
+
+    def __init__(self, items, registry=assets.registry):
+        self.registry = registry
+        # Images that an earlier run already holds are skipped
+        self.items = [item for item in items if not registry.has(*item)]
+        self.decoded = queue.Queue()
+        self.timings = []
+        self.finished = 0
+        self.started = None
+        self.elapsed = 0.0
+        self.thread = threading.Thread(target=self.work, daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.thread.start()
+        return self
+
+    def work(self):
+        for path, alpha in self.items:
+            try:
+                start = time.perf_counter()
+                with open(path, "rb") as file:
+                    data = file.read()
+                read = time.perf_counter()
+                surface = pygame.image.load(io.BytesIO(data), path)
+                decoded = time.perf_counter()
+            except Exception as error:  # re-raised on the main thread
+                self.decoded.put((path, alpha, error, 0.0, 0.0))
+                return
+            self.decoded.put((path, alpha, surface, read - start, decoded - read))
+
+    @property
+    def done(self):
+        return self.finished == len(self.items)
+
+    @property
+    def progress(self):
+        if not self.items:
+            return 1.0
+        return self.finished / len(self.items)
+
+    def poll(self, budget_ms=8.0, block=False):
+        """Convert decoded images until budget_ms is spent. With block True
+        wait for the worker until every image is in."""
+        deadline = time.perf_counter() + budget_ms / 1000
+        while not self.done:
+            try:
+                item = self.decoded.get(block=block)
+            except queue.Empty:
+                break
+            path, alpha, surface, read, decode = item
+            if isinstance(surface, Exception):
+                raise surface
+            start = time.perf_counter()
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            self.registry.install(path, surface, alpha)
+            self.timings.append((path, read, decode, time.perf_counter() - start))
+            self.finished += 1
+            if self.done:
+                self.elapsed = time.perf_counter() - self.started
+            elif not block and time.perf_counter() > deadline:
+                break
+        return self.done
+
+    def finish(self):
+        return self.poll(block=True)
+
+    def report(self):
+        lines = [
+            f"  {path:<56} read {read * 1000:6.1f} ms  decode {decode * 1000:6.1f} ms"
+            f"  convert {convert * 1000:6.1f} ms"
+            for path, read, decode, convert in self.timings
+        ]
+        lines.append(
+            f"  {len(self.timings)} images preloaded in {self.elapsed * 1000:.1f} ms"
+        )
+        return "\n".join(lines)
+
+
+class StartupTimer:
+    """Named startup milestones in milliseconds since construction."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name):
+        if name not in self.marks:
+            self.marks[name] = (time.perf_counter() - self.start) * 1000
+
+    def report(self):
+        return "Startup: " + ", ".join(
+            f"{name} at {ms:.1f} ms" for name, ms in self.marks.items()
+        )
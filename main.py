@@ -1,15 +1,34 @@
 import pygame
-import random
-import user_interface
+import assets
+import loading
+import pooling
+import replay
+import rng
 import sys
-from constants import SCREEN_WIDTH, SCREEN_HEIGHT
-from classes import Player
-from items import Food
-from functions import choose_enemy_type, place_enemy
+import time
+import timing
+import user_interface
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT, DIRTY_RECTS, FPS_CAP, MAX_FRAME_MS
 from game_state import GameState
+from inputs import Controls
+from render import DirtyRectRenderer
+from simulation import Round
+
+
+def restart(game_round, sim_clock):
+    """Rewind the clock, reseed and reset the round for another run, so it
+    plays back exactly like a fresh one. Assets, fonts, widgets and pools
+    stay loaded. Returns the new seed and its replay."""
+    started = time.perf_counter()
+    sim_clock.now = 0
+    seed = rng.seed()
+    game_round.reset()
+    print(f"Restarted in {(time.perf_counter() - started) * 1000:.2f} ms")
+    return seed, replay.Replay(seed)
 
 
 def main():
+    startup = loading.StartupTimer()
     print("Starting Orc Slayer!")
     print(f"Screen width: {SCREEN_WIDTH}")
     print(f"Screen height: {SCREEN_HEIGHT}")
@@ -18,6 +37,7 @@ def main():
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
+    startup.mark("display")
 
     # initialize music
     # music = pygame.mixer.Sound("./assets/music/pixelated_carnage_1.wav")
@@ -25,56 +45,16 @@ def main():
     running = True
     play_game = False
 
-    title_background = pygame.image.load(
-        "./assets/images/backgrounds/menu_screen.png"
-    ).convert()
-    death_screen = pygame.image.load(
-        "./assets/images/backgrounds/death_screen.png"
-    ).convert()
-    victory_screen = pygame.image.load(
-        "./assets/images/backgrounds/victory_screen.png"
-    ).convert()
-
-    player = pygame.image.load("./assets/images/player.png").convert_alpha()
-
-    background = pygame.image.load(
-        "./assets/images/backgrounds/dungeon_brick_wall_blue.png"
-    ).convert()
-
-    screen.blit(background, (0, 0))
-
-    # Player init
-    p = Player(player, 3.0, 10, 10)
-
-    # Initialize in game items
-    food_objects = []
-
-    # Where enemies live
-    objects = []
-
-    # Initialize UI
-    player_level = user_interface.PlayerLevel(p)
-    xp_bar = user_interface.ExperienceBar(p)
-    health_bar = user_interface.HealthBar(p)
-    # score = user_interface.Score(p)
-    timer = user_interface.Timer()
-
-    spawn_interval = random.randint(0, 1700)
-    timer_started = False
-    start_time = 0
-    remaining_sec = 0
-    remaining_ms = 0
-    last_spawn_time = 0
-    ROUND_DURATION_MS = 600_000
-
-    # Cooldown initialization
-    damage_tick = 0
-    damaged = False
+    # Images are read and decoded on a worker thread while the title
+    # screen shows progress; the round is built once they are all in
+    loader = loading.Preloader(loading.startup_assets()).start()
+    loading_bar = user_interface.LoadingBar()
+    title_background = None
+    game_round = None
 
-    create_food = False
-
-    attack_cooldown = 0
-    on_cooldown = False
+    # Gameplay time only moves in fixed steps, decoupled from the frame rate
+    sim_clock = timing.FixedClock()
+    timing.use_clock(sim_clock)
 
     state_input = GameState.MENU
 
@@ -89,6 +69,7 @@ def main():
                             event.type == pygame.KEYDOWN
                             and not pygame.key.get_pressed()[pygame.K_q]
                             and not pygame.key.get_pressed()[pygame.K_ESCAPE]
+                            and game_round is not None
                         ):
                             state_input = GameState.PLAY
                             play_game = True
@@ -99,206 +80,103 @@ def main():
                         ):
                             running = False
                             break
-                    screen.blit(title_background, (0, 0))
+
+                    # The title image is the first one the loader decodes
+                    loader.poll()
+                    if title_background is None and assets.registry.has(
+                        "./assets/images/backgrounds/menu_screen.png", alpha=False
+                    ):
+                        title_background = assets.load_image(
+                            "./assets/images/backgrounds/menu_screen.png", alpha=False
+                        )
+                    if title_background is None:
+                        screen.fill((0, 0, 0))
+                    else:
+                        screen.blit(title_background, (0, 0))
+                    if game_round is None:
+                        loading_bar.draw(screen, loader.progress)
                     pygame.display.flip()
+                    startup.mark("first frame")
+
+                    if game_round is None and loader.done:
+                        death_screen = assets.load_image(
+                            "./assets/images/backgrounds/death_screen.png", alpha=False
+                        )
+                        victory_screen = assets.load_image(
+                            "./assets/images/backgrounds/victory_screen.png",
+                            alpha=False,
+                        )
+                        background = assets.load_image(
+                            "./assets/images/backgrounds/dungeon_brick_wall_blue.png",
+                            alpha=False,
+                        )
+
+                        # Player, enemies, items and timers for this round,
+                        # recorded so it can be replayed
+                        seed = rng.seed()
+                        recording = replay.Replay(seed)
+                        game_round = Round()
+                        profiler_overlay = user_interface.ProfilerOverlay(
+                            game_round.profiler, game_round
+                        )
+                        renderer = DirtyRectRenderer(background, enabled=DIRTY_RECTS)
+                        startup.mark("round ready")
+                        print(loader.report())
+                        print(startup.report())
+
                     clock.tick(60)
                     if play_game:
                         break
 
             case GameState.PLAY:
+                renderer.invalidate()
+                # Time spent in the menu does not count toward the round
+                clock.tick()
+                accumulator = 0.0
+                attack_pressed = False
+                outcome = None
                 while running:
-                    # Start Timer
-                    if not timer_started:
-                        start_time = pygame.time.get_ticks()
-                        last_spawn_time = start_time
-                        timer_started = True
-
-                    current_time = pygame.time.get_ticks()
-
-                    elapsed_ms = current_time - start_time
-                    remaining_ms = max(0, ROUND_DURATION_MS - elapsed_ms)
-                    elapsed_sec = elapsed_ms // 1000
-                    remaining_sec = remaining_ms // 1000
-                    # Round lasts 10 minutes
-                    if remaining_ms <= 0:
-                        state_input = GameState.WIN
-                        break
-                    # Spawn logic
-                    if current_time - last_spawn_time >= spawn_interval:
-                        enemy_class = choose_enemy_type(elapsed_sec)
-                        if enemy_class:
-                            o = enemy_class()
-                            place_enemy(o)
-                            objects.append(o)
-                        last_spawn_time = current_time
-                        spawn_interval = random.randint(1000, 3000)
-
-                    # Player input
-                    p.update(objects)
-
-                    for event in pygame.event.get():
+                    game_round.profiler.begin_frame()
+                    accumulator += min(clock.tick(FPS_CAP), MAX_FRAME_MS)
+                    events = pygame.event.get()
+                    for event in events:
                         if event.type == pygame.QUIT:
                             running = False
-                        if event.type == pygame.KEYDOWN:
-                            if event.key == pygame.K_SPACE and not on_cooldown:
-                                p.basic_attack(screen)
-                                p.start_slash()
-                                on_cooldown = True
-
-                    # Update logic
-                    target = p.pos.center
-
-                    # Update bolts
-                    p.bolts = [bolt for bolt in p.bolts if not bolt.update(objects)]
-
-                    # Update axes
-                    p.axes = [axe for axe in p.axes if not axe.update(objects)]
-
-                    # Update flail
-                    p.flails = [
-                        flail for flail in p.flails if not flail.update(p, objects)
-                    ]
-
-                    # Move enemies
-                    for o in objects:
-                        o.move_toward(target)
-
-                    # Player damaged
-                    for o in objects:
-                        if o.hitbox.colliderect(p.hitbox) and damage_tick == 0:
-                            if type(o).__name__ == "SpecialEnemy":
-                                p.take_damage(5)
-                            else:
-                                p.take_damage()
-                            damaged = True
-                            damage_tick = 1
-
-                    # Enemy damage
-                    if p.arc_active:
-                        p.draw_arc(screen)
-                        for o in objects:
-                            if o.hitbox.colliderect(p.attack_hitbox):
-                                if o not in p.hit_enemies:
-                                    o.take_damage()
-                                    p.hit_enemies.append(o)
-
-                    # Player ability block
-                    for ab in p.abilities:
-                        ab.update()
-
-                    for ab in p.abilities:
-                        if ab.ready():
-                            ab.fire(p, objects)
-                            ab.start_cooldown()
-
-                    # Increment score
-                    for o in objects:
-                        got_xp = p.get_xp(o)
-                        if got_xp:
-                            create_food = True
-
-                    # Food chance
-                    if create_food is True:
-                        if random.randrange(0, 101) <= 10:
-                            food_objects.append(Food())
-                            create_food = False
-
-                    # Player eats food
-                    for food in food_objects:
-                        if food.food_rect.colliderect(p.hitbox):
-                            food.get_eaten(p)
-
-                    food_objects = [
-                        food
-                        for food in food_objects
-                        if not food.food_rect.colliderect(p.hitbox)
-                    ]
-
-                    # Remove dead enemies
-                    objects = [o for o in objects if o.health > 0]
-
-                    # Check if dead
-                    if p.health <= 0:
-                        state_input = GameState.LOSE
-
+                        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                            profiler_overlay.toggle()
+
+                    # Player input and as many fixed simulation steps as the
+                    # elapsed time covers. A key press is kept until a step
+                    # has seen it, even on frames that run no step.
+                    controls = Controls.from_keyboard(events)
+                    attack_pressed = attack_pressed or controls.attack_pressed
+                    while accumulator >= timing.STEP_MS:
+                        controls.attack_pressed = attack_pressed
+                        attack_pressed = False
+                        recording.record(controls)
+                        outcome = game_round.update(sim_clock.get_ticks(), controls)
+                        sim_clock.advance()
+                        accumulator -= timing.STEP_MS
+                        if outcome is not None:
+                            break
+                    if outcome is not None:
+                        state_input = outcome
+                        print(assets.registry.summary())
+                        print(pooling.summary())
+                        replay_path = replay.default_path(seed)
+                        recording.save(replay_path)
+                        print(f"Replay saved to {replay_path}")
                         break
 
-                    # Draw
-                    screen.blit(background, (0, 0))
-                    p.hitbox.center = p.pos.center
-                    for o in objects:
-                        o.hitbox.center = o.rect.center
-
-                    # Draw player level
-                    xp_bar.draw(screen)
-
-                    # health bar
-                    health_bar.draw(screen)
-
-                    p.draw(screen)
-
-                    # slash
-                    if p.slash_active:
-                        src_rect = pygame.Rect(
-                            p.slash_index * p.slash_w, 0, p.slash_w, p.slash_h
-                        )
-                        frame = p.slash_sheet.subsurface(src_rect)
-                        if p.facing == "left":
-                            frame = pygame.transform.flip(frame, True, False)
-                        dst_rect = frame.get_rect()
-                        offset = 18
-                        if p.facing == "right":
-                            dst_rect.midleft = (p.pos.right - offset, p.pos.centery)
-                        else:
-                            dst_rect.midright = (p.pos.left + offset, p.pos.centery)
+                    # Draw between the last two steps
+                    alpha = accumulator / timing.STEP_MS
+                    game_round.draw(screen, background, renderer, alpha)
+                    renderer.add(profiler_overlay.draw(screen))
 
-                        screen.blit(frame, dst_rect)
+                    with game_round.profiler.section("present"):
+                        renderer.present()
 
-                    for food in food_objects:
-                        screen.blit(food.image, food.food_rect)
-
-                    for o in objects:
-                        screen.blit(o.image, o.rect)
-
-                    # draw bolts
-                    for bolt in p.bolts:
-                        bolt.draw(screen)
-
-                    # draw axes
-                    for axe in p.axes:
-                        axe.draw(screen)
-
-                    # draw flail
-                    for flail in p.flails:
-                        flail.draw(screen)
-
-                    # Draw Timer
-                    timer.draw(screen, remaining_sec)
-
-                    # draw PlayerLevel
-                    player_level.draw(screen)
-
-                    # Draw Score score_counter
-                    # score.draw(screen)
-
-                    # Cooldowns
-                    create_food = False
-
-                    if damaged:
-                        damage_tick += 1
-                        if damage_tick > 30:
-                            damage_tick = 0
-                            damaged = False
-
-                    if on_cooldown:
-                        attack_cooldown += 1
-                        if attack_cooldown > 20:
-                            attack_cooldown = 0
-                            on_cooldown = False
-
-                    pygame.display.update()
-
-                    clock.tick(60)
+                    game_round.profiler.end_frame()
 
                     # Check to break
                     if not running:
@@ -326,7 +204,7 @@ def main():
 
                     screen.blit(death_screen, (0, 0))
                     # Draw Timer
-                    timer.draw(screen, remaining_sec)
+                    game_round.draw_timer(screen)
 
                     # Draw Score score_counter
                     # score.draw(screen)
@@ -334,7 +212,8 @@ def main():
                     pygame.display.flip()
                     clock.tick(60)
                     if play_game:
-                        main()
+                        seed, recording = restart(game_round, sim_clock)
+                        break
 
             case GameState.WIN:
                 play_game = False
@@ -359,7 +238,7 @@ def main():
                     screen.blit(victory_screen, (0, 0))
 
                     # Draw Timer
-                    timer.draw(screen, remaining_sec)
+                    game_round.draw_timer(screen)
 
                     # Draw Score score_counter
                     # score.draw(screen)
@@ -367,7 +246,8 @@ def main():
                     pygame.display.flip()
                     clock.tick(60)
                     if play_game:
-                        main()
+                        seed, recording = restart(game_round, sim_clock)
+                        break
 
     pygame.quit()
     sys.exit()
@@ -0,0 +1,74 @@
+class Pool:
+    """Free list of dead instances of one class.
+
+    acquire() hands back a recycled instance after calling its
+    reset(*args) or builds a new one when the free list is empty.
+    release() returns an instance to the free list.
+    """
+
+    def __init__(self, cls, name=None):
+        self.cls = cls
+        self.name = name or cls.__name__
+        self.free = []
+        self.created = 0
+        self.live = 0
+        self.high_water = 0
+        registry[self.name] = self
+
+    def acquire(self, *args, **kwargs):
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args, **kwargs)
+        else:
+            obj = self.cls(*args, **kwargs)
+            self.created += 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return obj
+
+    def release(self, obj):
+        self.live -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "live": self.live,
+            "free": len(self.free),
+            "high_water": self.high_water,
+        }
+
+
+def compact(items, keep, pool=None, pools=None):
+    """Drop items for which keep(item) is falsy, in place and in order.
+
+    Dropped items go back to `pool`, or to pools[type(item)] when the list
+    mixes classes. The list object itself is reused, so no new list is
+    built every frame.
+    """
+    write = 0
+    for item in items:
+        if keep(item):
+            items[write] = item
+            write += 1
+        elif pool is not None:
+            pool.release(item)
+        elif pools is not None:
+            pools[type(item)].release(item)
+    del items[write:]
+
+
+# Every pool by name, for reporting
+registry = {}
+
+
+def stats():
+    return {name: pool.stats() for name, pool in registry.items()}
+
+
+def summary():
+    return "Pools: " + ", ".join(
+        f"{name} {pool.high_water} peak / {pool.created} built"
+        for name, pool in registry.items()
+    )
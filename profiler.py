@@ -0,0 +1,98 @@
+import time
+from collections import deque
+
+# Upper bounds (ms) of the frame-time histogram buckets; 16.7 ms is 60 FPS
+HISTOGRAM_BOUNDS = (8.0, 16.7, 25.0, 33.3, 50.0, float("inf"))
+
+
+class Section:
+    """Context manager that adds its elapsed time to one profiler section."""
+
+    __slots__ = ("totals", "name", "start", "last")
+
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+        self.start = 0.0
+        # Seconds taken by the most recent run of the section
+        self.last = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.start
+        self.last = elapsed
+        self.totals[self.name] = self.totals.get(self.name, 0.0) + elapsed
+        return False
+
+
+class FrameProfiler:
+    """Rolling per-section timings for the last `window` frames.
+
+    Wrap work in `with profiler.section("name"):` and call begin_frame()
+    and end_frame() around each frame. Sections are reported in the
+    order they were first seen.
+    """
+
+    def __init__(self, window=120):
+        self.window = window
+        self.history = {}
+        self.frame_times = deque(maxlen=window)
+        self.totals = {}
+        self.sections = {}
+        self.frame_start = None
+
+    def section(self, name):
+        section = self.sections.get(name)
+        if section is None:
+            section = Section(self.totals, name)
+            self.sections[name] = section
+            self.history[name] = deque(maxlen=self.window)
+        return section
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        if self.frame_start is not None:
+            self.frame_times.append((time.perf_counter() - self.frame_start) * 1000)
+            self.frame_start = None
+        totals = self.totals
+        for name, history in self.history.items():
+            history.append(totals.get(name, 0.0) * 1000)
+        totals.clear()
+
+    def averages(self):
+        """Mean milliseconds per frame for every section."""
+        return {
+            name: sum(history) / len(history) if history else 0.0
+            for name, history in self.history.items()
+        }
+
+    def frame_time(self):
+        if not self.frame_times:
+            return 0.0
+        return sum(self.frame_times) / len(self.frame_times)
+
+    def histogram(self, bounds=HISTOGRAM_BOUNDS):
+        """Frame counts per bucket, bucket i holding times <= bounds[i]."""
+        counts = [0] * len(bounds)
+        for ms in self.frame_times:
+            for i, bound in enumerate(bounds):
+                if ms <= bound:
+                    counts[i] += 1
+                    break
+        return counts
+
+    def report(self):
+        """Snapshot of the rolling timings, suitable for logging as JSON."""
+        return {
+            "frame_ms": round(self.frame_time(), 3),
+            "max_frame_ms": round(max(self.frame_times, default=0.0), 3),
+            "sections_ms": {name: round(ms, 3) for name, ms in self.averages().items()},
+            "histogram": dict(
+                zip((str(bound) for bound in HISTOGRAM_BOUNDS), self.histogram())
+            ),
+        }
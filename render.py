@@ -0,0 +1,73 @@
+import pygame
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+# Past this share of the screen a single full update is cheaper
+FULL_UPDATE_AREA = 0.5 * SCREEN_WIDTH * SCREEN_HEIGHT
+MAX_DIRTY_RECTS = 400
+
+
+def interpolate_rect(rect, prev_center, alpha):
+    """Rect moved back toward prev_center by (1 - alpha), for drawing an
+    entity between its last two simulation steps."""
+    if alpha >= 1.0:
+        return rect
+    back = 1.0 - alpha
+    return rect.move(
+        round((prev_center[0] - rect.centerx) * back),
+        round((prev_center[1] - rect.centery) * back),
+    )
+
+
+class DirtyRectRenderer:
+    """Restores and presents only the screen regions that changed.
+
+    Each frame, begin() paints the background back over last frame's
+    rects, the caller draws everything and reports the drawn areas
+    through add()/extend(), then present() pushes the union of last
+    frame's and this frame's rects to the display. With enabled False
+    it falls back to a full background blit and full display update.
+    """
+
+    def __init__(self, background, enabled=True):
+        self.background = background
+        self.enabled = enabled
+        self.previous = []
+        self.current = []
+        self.full_frame = True
+
+    def invalidate(self):
+        """Redraw the whole frame next time, e.g. after another screen."""
+        self.full_frame = True
+
+    def begin(self, screen):
+        if not self.enabled or self.full_frame:
+            screen.blit(self.background, (0, 0))
+        else:
+            background = self.background
+            for rect in self.previous:
+                screen.blit(background, rect, rect)
+        self.current = []
+
+    def add(self, rect):
+        if rect:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        for rect in rects:
+            if rect:
+                self.current.append(rect)
+
+    def present(self):
+        dirty = self.previous + self.current
+        full = not self.enabled or self.full_frame or len(dirty) > MAX_DIRTY_RECTS
+        if not full:
+            area = sum(rect.width * rect.height for rect in dirty)
+            full = area > FULL_UPDATE_AREA
+        if full:
+            pygame.display.update()
+        else:
+            pygame.display.update(dirty)
+        self.previous = self.current
+        self.current = []
+        # A disabled renderer keeps redrawing everything
+        self.full_frame = not self.enabled
@@ -0,0 +1,249 @@
+import argparse
+import heapq
+import json
+import os
+import struct
+import time
+import pygame
+import assets
+import constants
+import headless
+import rng
+import spawning
+import swarm
+import timing
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from inputs import Controls
+from simulation import Round
+
+MAGIC = b"OSRP"
+VERSION = 2
+# magic, version, backend flags, seed, step length in ms, tick count,
+# separation radius, strength and budget
+HEADER = struct.Struct("<4sBB2xQdIddI")
+# Backend flags
+NUMPY = 1
+SWARM = 2
+# input mask and how many ticks in a row it was held
+RUN = struct.Struct("<BH")
+MAX_RUN = 0xFFFF
+
+REPLAY_DIR = "replays"
+BACKGROUND = "./assets/images/backgrounds/dungeon_brick_wall_blue.png"
+
+
+def simulation_backend():
+    """Everything besides the seed that decides how a round plays out:
+    (flags, separation radius, strength, budget). Without numpy, spawn
+    batches are drawn by random.Random, and only the numpy swarm moves
+    and separates enemies."""
+    flags = 0
+    if spawning.np is not None:
+        flags |= NUMPY
+    if constants.USE_SWARM and swarm.available():
+        flags |= SWARM
+        separation = (
+            constants.SEPARATION_RADIUS,
+            constants.SEPARATION_STRENGTH,
+            constants.SEPARATION_BUDGET,
+        )
+    else:
+        separation = (0.0, 0.0, 0)
+    return (flags, *separation)
+
+
+def describe_backend(backend):
+    flags, radius, strength, budget = backend
+    text = "numpy" if flags & NUMPY else "no numpy"
+    if flags & SWARM:
+        text += (
+            f", swarm with separation radius {radius:g}, "
+            f"strength {strength:g}, budget {budget}"
+        )
+    else:
+        text += ", no swarm"
+    return text
+
+
+class Replay:
+    """The seed of a round plus the input mask of every tick.
+
+    On disk a replay is a small header followed by run-length encoded
+    (mask, count) pairs, so a 10 minute round of mostly held keys takes a
+    few kilobytes. The header also records the simulation backend, since
+    the same seed plays out differently with and without numpy.
+    """
+
+    def __init__(self, seed, step_ms=timing.STEP_MS, masks=b"", backend=None):
+        if not 0 <= seed < 2**64:
+            raise ValueError(f"Replay seeds must fit 64 bits, got {seed}.")
+        self.seed = seed
+        self.step_ms = step_ms
+        self.masks = bytearray(masks)
+        self.backend = simulation_backend() if backend is None else tuple(backend)
+
+    def __len__(self):
+        return len(self.masks)
+
+    def record(self, controls):
+        self.masks.append(controls.to_mask())
+
+    def controls(self):
+        for mask in self.masks:
+            yield Controls.from_mask(mask)
+
+    def to_bytes(self):
+        flags, radius, strength, budget = self.backend
+        out = [
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                flags,
+                self.seed,
+                self.step_ms,
+                len(self.masks),
+                radius,
+                strength,
+                budget,
+            )
+        ]
+        masks = self.masks
+        i = 0
+        while i < len(masks):
+            mask = masks[i]
+            run = 1
+            while i + run < len(masks) and masks[i + run] == mask and run < MAX_RUN:
+                run += 1
+            out.append(RUN.pack(mask, run))
+            i += run
+        return b"".join(out)
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version = struct.unpack_from("<4sB", data)
+        if magic != MAGIC:
+            raise ValueError("Not an Orc Slayer replay.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported replay version {version}.")
+        (
+            _,
+            _,
+            flags,
+            seed,
+            step_ms,
+            ticks,
+            radius,
+            strength,
+            budget,
+        ) = HEADER.unpack_from(data)
+        masks = bytearray()
+        for mask, run in RUN.iter_unpack(data[HEADER.size :]):
+            masks.extend(bytes((mask,)) * run)
+        if len(masks) != ticks:
+            raise ValueError(f"Replay holds {len(masks)} ticks, header says {ticks}.")
+        return cls(seed, step_ms, masks, (flags, radius, strength, budget))
+
+    def save(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+
+def default_path(seed):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(REPLAY_DIR, f"{stamp}-{seed:016x}.osr")
+
+
+def play(replay, draw=False, slowest=10):
+    """Re-simulate a replay as fast as possible.
+
+    Returns the round summary plus the `slowest` ticks, each with its
+    time and per-section breakdown in milliseconds. With draw True every
+    tick is also rendered off screen, so drawing costs show up too.
+    Raises ValueError if the replay was recorded on another simulation
+    backend, as it would not play out the same here.
+    """
+    backend = simulation_backend()
+    if replay.backend != backend:
+        raise ValueError(
+            f"Replay was recorded with {describe_backend(replay.backend)}, "
+            f"this install runs {describe_backend(backend)}."
+        )
+    headless.init_display()
+    rng.seed(replay.seed)
+    clock = timing.FixedClock(step_ms=replay.step_ms)
+    previous_clock = timing.clock
+    timing.use_clock(clock)
+    dt = replay.step_ms / 1000
+    try:
+        game_round = Round()
+        prof = game_round.profiler
+        if draw:
+            screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+            background = assets.load_image(BACKGROUND, alpha=False)
+        worst = []
+        outcome = None
+        for tick, controls in enumerate(replay.controls()):
+            prof.begin_frame()
+            outcome = game_round.update(clock.get_ticks(), controls, dt)
+            if draw and outcome is None:
+                game_round.draw(screen, background)
+            sections = {name: seconds * 1000 for name, seconds in prof.totals.items()}
+            prof.end_frame()
+            entry = (prof.frame_times[-1], tick, sections)
+            if len(worst) < slowest:
+                heapq.heappush(worst, entry)
+            elif slowest:
+                heapq.heappushpop(worst, entry)
+            clock.advance()
+            if outcome is not None:
+                break
+    finally:
+        timing.use_clock(previous_clock)
+
+    summary = game_round.summary()
+    summary["seed"] = replay.seed
+    summary["outcome"] = outcome.name if outcome is not None else "TIMEOUT"
+    summary["slowest_ticks"] = [
+        {
+            "tick": tick,
+            "at_ms": round(tick * replay.step_ms),
+            "ms": round(ms, 3),
+            "sections_ms": {
+                name: round(value, 3)
+                for name, value in sorted(sections.items(), key=lambda item: -item[1])
+            },
+        }
+        for ms, tick, sections in sorted(worst, reverse=True)
+    ]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back an Orc Slayer replay.")
+    parser.add_argument("path")
+    parser.add_argument(
+        "--draw", action="store_true", help="also render every tick off screen"
+    )
+    parser.add_argument("--slowest", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        replay = Replay.load(args.path)
+        summary = play(replay, draw=args.draw, slowest=args.slowest)
+    except ValueError as error:
+        parser.error(str(error))
+    summary["wall_seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
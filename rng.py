@@ -0,0 +1,47 @@
+import hashlib
+import os
+import random
+
+
+def new_seed():
+    """A fresh 64-bit seed for a round that was not given one."""
+    return int.from_bytes(os.urandom(8), "little")
+
+
+class RandomStreams:
+    """Independent random.Random streams derived from one seed.
+
+    Every gameplay concern draws from its own named stream, so an extra
+    draw in one system (say a cosmetic sprite pick) never shifts what
+    another one (say spawning) sees. The same seed always reproduces the
+    same streams.
+    """
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.streams = {}
+
+    def stream(self, name):
+        stream = self.streams.get(name)
+        if stream is None:
+            digest = hashlib.sha256(f"{self.seed}:{name}".encode()).digest()
+            stream = random.Random(int.from_bytes(digest[:8], "little"))
+            self.streams[name] = stream
+        return stream
+
+
+# Streams read by gameplay code, reseeded at the start of every round
+streams = RandomStreams(new_seed())
+
+
+def seed(value=None):
+    """Reseed every stream; returns the seed used."""
+    global streams
+    if value is None:
+        value = new_seed()
+    streams = RandomStreams(value)
+    return value
+
+
+def stream(name):
+    return streams.stream(name)
@@ -0,0 +1,76 @@
+class System:
+    """One named step of a tick, run by a Scheduler."""
+
+    __slots__ = ("name", "run", "enabled")
+
+    def __init__(self, name, run, enabled=True):
+        self.name = name
+        self.run = run
+        self.enabled = enabled
+
+
+class Scheduler:
+    """Runs registered systems once each, in registration order.
+
+    Every call to run(*args) passes the same arguments to each enabled
+    system. A system that returns something other than None ends the tick
+    early and run() hands that value back, e.g. a GameState when the
+    round is over. With a profiler every system is timed in a section of
+    its own name, and each function in `hooks` is then called as
+    hook(name, elapsed_ms) after the system ran.
+    """
+
+    def __init__(self, profiler=None):
+        self.profiler = profiler
+        self.systems = []
+        self.by_name = {}
+        self.hooks = []
+
+    def __iter__(self):
+        return iter(self.systems)
+
+    def add(self, name, run, enabled=True):
+        if name in self.by_name:
+            raise ValueError(f"System {name!r} is already registered.")
+        system = System(name, run, enabled)
+        self.systems.append(system)
+        self.by_name[name] = system
+        return system
+
+    def get(self, name):
+        system = self.by_name.get(name)
+        if system is None:
+            known = ", ".join(self.by_name)
+            raise ValueError(f"Unknown system {name!r}, expected one of: {known}.")
+        return system
+
+    def enable(self, *names):
+        for name in names:
+            self.get(name).enabled = True
+
+    def disable(self, *names):
+        for name in names:
+            self.get(name).enabled = False
+
+    def names(self):
+        return [system.name for system in self.systems]
+
+    def run(self, *args):
+        profiler = self.profiler
+        hooks = self.hooks
+        for system in self.systems:
+            if not system.enabled:
+                continue
+            if profiler is None:
+                result = system.run(*args)
+            else:
+                section = profiler.section(system.name)
+                with section:
+                    result = system.run(*args)
+                if hooks:
+                    elapsed_ms = section.last * 1000
+                    for hook in hooks:
+                        hook(system.name, elapsed_ms)
+            if result is not None:
+                return result
+        return None
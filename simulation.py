@@ -0,0 +1,433 @@
+import pygame
+import rng
+import abilities
+import assets
+import events
+import pooling
+import spawning
+import swarm
+import timing
+import user_interface
+from constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    SEPARATION_BUDGET,
+    SEPARATION_RADIUS,
+    SEPARATION_STRENGTH,
+    USE_SWARM,
+)
+from classes import Player, enemy_pools
+from items import food_pool
+from game_state import GameState
+from profiler import FrameProfiler
+from scheduler import Scheduler
+from spatial import SpatialHash
+
+ROUND_DURATION_MS = 600_000
+
+# Seconds of invulnerability after contact damage
+DAMAGE_COOLDOWN = 0.5
+# Seconds between basic attacks
+ATTACK_COOLDOWN = 0.35
+
+
+class Round:
+    """State and per-tick logic of one 10 minute round.
+
+    update() advances the simulation and never touches the display, so a
+    round can run headless. draw() renders the current state. Both run
+    their work as named systems (see scheduler.Scheduler), which can be
+    disabled one by one.
+    """
+
+    def __init__(self):
+        # Player init
+        self.player = Player(
+            assets.load_image("./assets/images/player.png"), 180.0, 10, 10
+        )
+
+        # Initialize in game items
+        self.food_objects = []
+
+        # Where enemies live
+        self.objects = []
+
+        # Collision grids, rebuilt once per tick
+        self.enemy_grid = SpatialHash()
+        self.food_grid = SpatialHash(key=lambda food: food.food_rect)
+
+        # Optional vectorized enemy movement
+        self.enemy_swarm = swarm.Swarm() if USE_SWARM and swarm.available() else None
+        self.view = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # What spawns when, read from the spawn timeline
+        self.director = spawning.SpawnDirector(spawning.load_timeline())
+
+        # UI is built on the first draw, headless rounds never need it
+        self.hud = None
+
+        # Per-section timings, shown by the profiler overlay
+        self.profiler = FrameProfiler()
+
+        # Gameplay and drawing steps, each run once per tick or frame
+        self.systems = self.build_systems()
+        self.render_systems = self.build_render_systems()
+
+        self.reset()
+
+    def reset(self):
+        """Start a new run in place. Enemies, food and projectiles go back
+        to their pools; the player, HUD, grids and systems are kept.
+        Reseed rng before calling this to get a fresh run."""
+        p = self.player
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.clear()
+        pooling.compact(self.objects, lambda o: False, pools=enemy_pools)
+        pooling.compact(self.food_objects, lambda food: False, food_pool)
+        pooling.compact(p.bolts, lambda bolt: False, abilities.bolt_pool)
+        pooling.compact(p.axes, lambda axe: False, abilities.axe_pool)
+        pooling.compact(p.flails, lambda flail: False, abilities.flail_pool)
+        p.reset()
+        # Nothing may find the last run's enemies before the next broadphase
+        self.enemy_grid.clear()
+        self.food_grid.clear()
+        # Deaths left over from an earlier run must not pay out here
+        events.deaths.clear()
+
+        self.director.reset()
+        self.timer_started = False
+        self.start_time = 0
+        self.elapsed_ms = 0
+        self.remaining_sec = 0
+        self.remaining_ms = 0
+
+        # Cooldowns, in seconds left
+        self.damage_cooldown = 0.0
+        self.attack_cooldown = 0.0
+
+        # Round statistics
+        self.ticks = 0
+        self.kills = 0
+        self.peak_enemies = 0
+
+    def build_systems(self):
+        """Register the per-tick systems in the order they run."""
+        systems = Scheduler(self.profiler)
+        systems.add("spawning", self.spawn_enemies)
+        systems.add("broadphase", self.index_enemies)
+        systems.add("input", self.apply_input)
+        systems.add("projectiles", self.move_projectiles)
+        systems.add("movement", self.move_enemies)
+        systems.add("collision", self.resolve_contacts)
+        systems.add("abilities", self.fire_abilities)
+        systems.add("rewards", self.grant_rewards)
+        systems.add("pickups", self.update_pickups)
+        systems.add("defeat", self.check_defeat)
+        systems.add("cooldowns", self.tick_cooldowns)
+        return systems
+
+    def build_render_systems(self):
+        """Register the drawing systems, run by draw() in this order."""
+        systems = Scheduler(self.profiler)
+        systems.add("bars", self.draw_bars)
+        systems.add("sprites", self.draw_sprites)
+        systems.add("labels", self.draw_labels)
+        return systems
+
+    def update(self, current_time, controls=None, dt=timing.FIXED_DT):
+        """Advance one fixed step of dt seconds. Returns GameState.WIN or LOSE
+        when the round ends."""
+        # Start Timer
+        if not self.timer_started:
+            self.start_time = current_time
+            self.timer_started = True
+
+        self.elapsed_ms = current_time - self.start_time
+        self.remaining_ms = max(0, ROUND_DURATION_MS - self.elapsed_ms)
+        self.remaining_sec = self.remaining_ms // 1000
+        # Round lasts 10 minutes
+        if self.remaining_ms <= 0:
+            return GameState.WIN
+        self.ticks += 1
+
+        return self.systems.run(current_time, controls, dt)
+
+    def add_enemies(self, batch):
+        """Put freshly placed enemies on the field."""
+        objects = self.objects
+        for o in batch:
+            o.index = len(objects)
+            objects.append(o)
+        if self.enemy_swarm is not None:
+            self.enemy_swarm.extend(batch)
+
+    def spawn_enemies(self, current_time, controls, dt):
+        for types, xs, ys in self.director.update(self.elapsed_ms, len(self.objects)):
+            batch = [enemy_pools[enemy_class].acquire() for enemy_class in types]
+            for o, x, y in zip(batch, xs, ys):
+                o.pos = [x, y]
+                o.rect.center = (int(x), int(y))
+                o.hitbox.center = o.rect.center
+            self.add_enemies(batch)
+        self.peak_enemies = max(self.peak_enemies, len(self.objects))
+
+    def index_enemies(self, current_time, controls, dt):
+        # Index enemy hitboxes for this tick's collision queries
+        self.enemy_grid.rebuild(self.objects)
+
+    def apply_input(self, current_time, controls, dt):
+        p = self.player
+        p.update(controls, dt)
+
+        attack_pressed = controls is not None and controls.attack_pressed
+        if attack_pressed and self.attack_cooldown <= 0:
+            p.basic_attack()
+            p.start_slash()
+            self.attack_cooldown = ATTACK_COOLDOWN
+
+    def move_projectiles(self, current_time, controls, dt):
+        p = self.player
+        enemy_grid = self.enemy_grid
+
+        # Update bolts
+        pooling.compact(
+            p.bolts,
+            lambda bolt: not bolt.update(enemy_grid, dt),
+            abilities.bolt_pool,
+        )
+
+        # Update axes
+        pooling.compact(
+            p.axes, lambda axe: not axe.update(enemy_grid, dt), abilities.axe_pool
+        )
+
+        # Update flail
+        pooling.compact(
+            p.flails,
+            lambda flail: not flail.update(p, enemy_grid, dt),
+            abilities.flail_pool,
+        )
+
+    def move_enemies(self, current_time, controls, dt):
+        target = self.player.pos.center
+        enemy_swarm = self.enemy_swarm
+        if enemy_swarm is not None:
+            enemy_swarm.step(target, dt)
+            if SEPARATION_STRENGTH > 0:
+                # Keeps hordes from stacking onto one point
+                with self.profiler.section("separation"):
+                    enemy_swarm.separate(
+                        SEPARATION_RADIUS, SEPARATION_STRENGTH, dt, SEPARATION_BUDGET
+                    )
+            enemy_swarm.sync(self.view)
+        else:
+            for o in self.objects:
+                o.move_toward(target, dt)
+
+    def resolve_contacts(self, current_time, controls, dt):
+        p = self.player
+        enemy_grid = self.enemy_grid
+
+        # Player damaged
+        for o in enemy_grid.query_rect(p.hitbox):
+            if self.damage_cooldown <= 0:
+                p.take_damage(o.archetype.contact_damage)
+                self.damage_cooldown = DAMAGE_COOLDOWN
+
+        # Enemy damage
+        if p.arc_active:
+            for o in enemy_grid.query_rect(p.attack_hitbox):
+                if p.swing.first_hit(o):
+                    o.take_damage()
+
+    def fire_abilities(self, current_time, controls, dt):
+        p = self.player
+        for ab in p.abilities:
+            ab.update(dt)
+
+        for ab in p.abilities:
+            if ab.ready():
+                ab.fire(p, self.enemy_grid)
+                ab.start_cooldown()
+
+    def grant_rewards(self, current_time, controls, dt):
+        """Handle this tick's deaths: XP and score, a food roll and
+        returning the dead enemies to their pools."""
+        p = self.player
+        objects = self.objects
+        enemy_swarm = self.enemy_swarm
+        killed = 0
+        for o in events.deaths.drain():
+            p.get_xp(o)
+            if enemy_swarm is not None:
+                enemy_swarm.remove(o)
+            # Move the last enemy into the freed index, so the cost
+            # follows the kills rather than the size of the horde
+            last = objects.pop()
+            if last is not o:
+                objects[o.index] = last
+                last.index = o.index
+            o.index = -1
+            enemy_pools[type(o)].release(o)
+            killed += 1
+        if not killed:
+            return None
+        self.kills += killed
+
+        # Food chance, once per tick with kills
+        if rng.stream("loot").randrange(0, 101) <= 10:
+            self.food_objects.append(food_pool.acquire())
+        return None
+
+    def update_pickups(self, current_time, controls, dt):
+        p = self.player
+
+        # Player eats food
+        self.food_grid.rebuild(self.food_objects)
+        eaten = self.food_grid.query_rect(p.hitbox)
+        if eaten:
+            for food in eaten:
+                food.get_eaten(p)
+            eaten_ids = {id(food) for food in eaten}
+            pooling.compact(
+                self.food_objects, lambda food: id(food) not in eaten_ids, food_pool
+            )
+
+    def check_defeat(self, current_time, controls, dt):
+        # Check if dead
+        if self.player.health <= 0:
+            return GameState.LOSE
+        return None
+
+    def tick_cooldowns(self, current_time, controls, dt):
+        # Hitboxes follow the sprites for the next tick
+        p = self.player
+        p.hitbox.center = p.pos.center
+        for o in self.objects:
+            o.hitbox.center = o.rect.center
+
+        # Cooldowns
+        if self.damage_cooldown > 0:
+            self.damage_cooldown -= dt
+
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= dt
+
+    def init_hud(self):
+        p = self.player
+        self.hud = {
+            "player_level": user_interface.PlayerLevel(p),
+            "xp_bar": user_interface.ExperienceBar(p),
+            "health_bar": user_interface.HealthBar(p),
+            # "score": user_interface.Score(p),
+            "timer": user_interface.Timer(),
+        }
+
+    def draw(self, screen, background, renderer=None, alpha=1.0):
+        """Render the round. With a render.DirtyRectRenderer only the areas
+        that changed are restored and reported to it.
+
+        alpha in [0, 1] is how far the frame lies between the previous and
+        the current simulation step; moving sprites are drawn interpolated.
+        """
+        if self.hud is None:
+            self.init_hud()
+        dirty = []
+
+        with self.profiler.section("background"):
+            if renderer is None:
+                screen.blit(background, (0, 0))
+            else:
+                renderer.begin(screen)
+
+        self.render_systems.run(screen, dirty, alpha)
+
+        if renderer is not None:
+            renderer.extend(dirty)
+
+    def draw_bars(self, screen, dirty, alpha):
+        hud = self.hud
+
+        # Draw player level
+        dirty.append(hud["xp_bar"].draw(screen))
+
+        # health bar
+        dirty.append(hud["health_bar"].draw(screen))
+
+    def draw_labels(self, screen, dirty, alpha):
+        # Draw Timer
+        dirty.append(self.draw_timer(screen))
+
+        # draw PlayerLevel
+        dirty.append(self.hud["player_level"].draw(screen))
+
+        # Draw Score score_counter
+        # dirty.append(hud["score"].draw(screen))
+
+    def draw_sprites(self, screen, dirty, alpha=1.0):
+        p = self.player
+        dirty.append(p.draw(screen, alpha))
+
+        # slash
+        if p.slash_active:
+            if p.facing == "left":
+                frame = p.slash_sheet.flipped_frames[p.slash_index]
+            else:
+                frame = p.slash_sheet.frames[p.slash_index]
+            dst_rect = frame.get_rect()
+            offset = 18
+            if p.facing == "right":
+                dst_rect.midleft = (p.pos.right - offset, p.pos.centery)
+            else:
+                dst_rect.midright = (p.pos.left + offset, p.pos.centery)
+            dst_rect.move_ip(p.render_offset(alpha))
+
+            dirty.append(screen.blit(frame, dst_rect))
+
+        # melee swing arc
+        if p.arc_active:
+            dirty.append(p.draw_arc(screen, alpha))
+
+        for food in self.food_objects:
+            dirty.append(screen.blit(food.image, food.food_rect))
+
+        for o in self.objects:
+            dirty.append(o.draw(screen, alpha))
+
+        # draw bolts
+        for bolt in p.bolts:
+            dirty.append(bolt.draw(screen, alpha))
+
+        # draw axes
+        for axe in p.axes:
+            dirty.append(axe.draw(screen, alpha))
+
+        # draw flail
+        for flail in p.flails:
+            dirty.append(flail.draw(screen, alpha))
+
+    def draw_timer(self, screen):
+        if self.hud is None:
+            self.init_hud()
+        return self.hud["timer"].draw(screen, self.remaining_sec)
+
+    def entity_counts(self):
+        p = self.player
+        return {
+            "enemies": len(self.objects),
+            "bolts": len(p.bolts),
+            "axes": len(p.axes),
+            "flails": len(p.flails),
+            "food": len(self.food_objects),
+        }
+
+    def summary(self):
+        p = self.player
+        return {
+            "ticks": self.ticks,
+            "survived_ms": self.elapsed_ms,
+            "level": p.level,
+            "score": p.score,
+            "kills": self.kills,
+            "peak_enemies": self.peak_enemies,
+        }
@@ -0,0 +1,190 @@
+import heapq
+import math
+import pygame
+
+# Enemy sprites are 100x75 with hitboxes around 55x56, so most hitboxes
+# land in one to four cells.
+DEFAULT_CELL_SIZE = 64
+
+
+class SpatialHash:
+    """Uniform grid over entity rects for overlap and radius queries.
+
+    Rebuild it once per tick. Query results come back in insertion order,
+    so a hit is the same enemy a full scan over the list would have found.
+    The hash also iterates like the list it was built from, so it can be
+    passed anywhere a list of enemies is expected.
+    """
+
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE, key=lambda e: e.hitbox):
+        self.cell_size = cell_size
+        self.key = key
+        self.cells = {}
+        self.entities = []
+        self.rects = []
+        self.bounds = None
+
+    def __len__(self):
+        return len(self.entities)
+
+    def __iter__(self):
+        return iter(self.entities)
+
+    def cell_range(self, left, top, right, bottom):
+        size = self.cell_size
+        return (
+            range(math.floor(left / size), math.floor(right / size) + 1),
+            range(math.floor(top / size), math.floor(bottom / size) + 1),
+        )
+
+    def clear(self):
+        self.cells.clear()
+        self.entities = []
+        self.rects = []
+        self.bounds = None
+
+    def insert(self, entity):
+        index = len(self.entities)
+        rect = self.key(entity)
+        self.entities.append(entity)
+        self.rects.append(rect)
+        cols, rows = self.cell_range(rect.left, rect.top, rect.right, rect.bottom)
+        if self.bounds is None:
+            self.bounds = [cols.start, rows.start, cols.stop, rows.stop]
+        else:
+            bounds = self.bounds
+            bounds[0] = min(bounds[0], cols.start)
+            bounds[1] = min(bounds[1], rows.start)
+            bounds[2] = max(bounds[2], cols.stop)
+            bounds[3] = max(bounds[3], rows.stop)
+        cells = self.cells
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [index]
+                else:
+                    bucket.append(index)
+
+    def rebuild(self, entities):
+        self.clear()
+        for entity in entities:
+            self.insert(entity)
+
+    def candidates(self, left, top, right, bottom):
+        """Sorted indices of entities in the cells covering the given bounds."""
+        cols, rows = self.cell_range(left, top, right, bottom)
+        cells = self.cells
+        found = set()
+        for cx in cols:
+            for cy in rows:
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return sorted(found)
+
+    def query_rect(self, rect):
+        """Entities whose rect overlaps `rect`."""
+        rect = pygame.Rect(rect)
+        rects = self.rects
+        return [
+            self.entities[i]
+            for i in self.candidates(rect.left, rect.top, rect.right, rect.bottom)
+            if rect.colliderect(rects[i])
+        ]
+
+    def first_rect(self, rect):
+        """First entity (in insertion order) whose rect overlaps `rect`."""
+        rect = pygame.Rect(rect)
+        rects = self.rects
+        for i in self.candidates(rect.left, rect.top, rect.right, rect.bottom):
+            if rect.colliderect(rects[i]):
+                return self.entities[i]
+        return None
+
+    def query_radius(self, x, y, radius):
+        """Entities whose rect comes within `radius` of the point (x, y)."""
+        hits = []
+        rects = self.rects
+        radius_sq = radius * radius
+        for i in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            r = rects[i]
+            nearest_x = min(max(x, r.left), r.right)
+            nearest_y = min(max(y, r.top), r.bottom)
+            if (nearest_x - x) ** 2 + (nearest_y - y) ** 2 <= radius_sq:
+                hits.append(self.entities[i])
+        return hits
+
+    # Targeting queries measure from the query point to rect centers.
+
+    def ring(self, cx, cy, r):
+        """Cells at Chebyshev distance r from cell (cx, cy)."""
+        if r == 0:
+            yield (cx, cy)
+            return
+        for x in range(cx - r, cx + r + 1):
+            yield (x, cy - r)
+            yield (x, cy + r)
+        for y in range(cy - r + 1, cy + r):
+            yield (cx - r, y)
+            yield (cx + r, y)
+
+    def k_nearest(self, x, y, k, max_distance=None):
+        """Up to k (entity, distance) pairs closest to (x, y), nearest first.
+
+        Searches outward ring by ring and stops once no unvisited cell can
+        hold anything closer, so the cost tracks local density rather than
+        the total number of entities.
+        """
+        if k <= 0 or self.bounds is None:
+            return []
+        size = self.cell_size
+        cx, cy = math.floor(x / size), math.floor(y / size)
+        min_x, min_y, max_x, max_y = self.bounds
+        max_ring = max(cx - min_x, cy - min_y, max_x - cx, max_y - cy)
+        limit = math.inf if max_distance is None else max_distance
+
+        cells = self.cells
+        rects = self.rects
+        seen = set()
+        best = []  # max-heap of (-distance, -index)
+        for r in range(max_ring + 1):
+            # Anything in ring r or beyond is at least (r - 1) cells away
+            reach = (r - 1) * size
+            if reach > limit or (len(best) == k and -best[0][0] < reach):
+                break
+            for cell in self.ring(cx, cy, r):
+                bucket = cells.get(cell)
+                if not bucket:
+                    continue
+                for i in bucket:
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    ex, ey = rects[i].center
+                    distance = math.hypot(ex - x, ey - y)
+                    if distance > limit:
+                        continue
+                    item = (-distance, -i)
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+        return [(self.entities[-i], -d) for d, i in sorted(best, reverse=True)]
+
+    def nearest(self, x, y, max_distance=None):
+        """Closest (entity, distance) to (x, y), or None."""
+        found = self.k_nearest(x, y, 1, max_distance)
+        return found[0] if found else None
+
+    def within(self, x, y, radius):
+        """(entity, distance) pairs with centers within radius, nearest first."""
+        rects = self.rects
+        hits = []
+        for i in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            ex, ey = rects[i].center
+            distance = math.hypot(ex - x, ey - y)
+            if distance <= radius:
+                hits.append((distance, i))
+        hits.sort()
+        return [(self.entities[i], distance) for distance, i in hits]
@@ -0,0 +1,225 @@
+import itertools
+import json
+import random
+import rng
+from classes import enemy_pools
+from constants import SCREEN_HEIGHT, SCREEN_WIDTH, SPRITE_HEIGHT, SPRITE_WIDTH
+
+try:
+    import numpy as np
+except ImportError:  # batches are placed one enemy at a time without it
+    np = None
+
+# Waves, spawn rates, type weights and caps of a round
+TIMELINE = "./assets/spawns/timeline.json"
+# Multiplies every spawn rate in the timeline; balance sweeps tune it
+RATE_SCALE = 1.0
+
+# Enemy classes by the archetype names a timeline uses
+ENEMY_TYPES = {cls.archetype.name: cls for cls in enemy_pools}
+
+
+class WeightTable:
+    """Enemy classes and their cumulative weights, precomputed once so a
+    batch of picks is a single search over the table."""
+
+    def __init__(self, weights):
+        unknown = set(weights) - set(ENEMY_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown enemy types: {', '.join(sorted(unknown))}.")
+        if not weights or min(weights.values()) <= 0:
+            raise ValueError("Spawn weights must be positive.")
+        self.types = tuple(ENEMY_TYPES[name] for name in weights)
+        self.cum_weights = tuple(itertools.accumulate(weights.values()))
+        self.total = self.cum_weights[-1]
+        if np is not None:
+            self.cum_array = np.array(self.cum_weights, dtype=float)
+
+    def choose(self, draws, count):
+        """`count` enemy classes drawn from the batch generator `draws`."""
+        if np is None:
+            return draws.choices(self.types, cum_weights=self.cum_weights, k=count)
+        picks = np.searchsorted(
+            self.cum_array, draws.random(count) * self.total, side="right"
+        )
+        return [self.types[i] for i in picks]
+
+
+class Segment:
+    """Steady spawning until `end_ms`: `count` enemies every interval_ms,
+    while fewer than `cap` are alive. Waves ignore the cap but count
+    toward it."""
+
+    def __init__(self, end_ms, interval_ms, count, cap, weights):
+        if min(interval_ms) <= 0:
+            raise ValueError(f"Spawn intervals must be positive, got {interval_ms}.")
+        self.end_ms = end_ms
+        self.interval_ms = tuple(interval_ms)
+        self.count = count
+        self.cap = cap
+        self.table = WeightTable(weights)
+
+
+class Wave:
+    """A one-off batch of `count` enemies at `at_ms`."""
+
+    def __init__(self, at_ms, count, weights):
+        self.at_ms = at_ms
+        self.count = count
+        self.table = WeightTable(weights)
+
+
+class Timeline:
+    """Spawn segments in time order plus the waves on top of them."""
+
+    def __init__(self, first_spawn_ms, segments, waves=()):
+        self.first_spawn_ms = tuple(first_spawn_ms)
+        self.segments = sorted(segments, key=lambda segment: segment.end_ms)
+        self.waves = sorted(waves, key=lambda wave: wave.at_ms)
+        # Nothing spawns once the last segment ends, waves included
+        if self.waves and (
+            not self.segments or self.waves[-1].at_ms >= self.segments[-1].end_ms
+        ):
+            end_s = self.segments[-1].end_ms / 1000 if self.segments else 0
+            raise ValueError(
+                f"Wave at {self.waves[-1].at_ms / 1000:g} s never spawns, "
+                f"the last segment ends at {end_s:g} s."
+            )
+
+    @classmethod
+    def from_dict(cls, data):
+        segments = [
+            Segment(
+                item["until_s"] * 1000,
+                item["interval_ms"],
+                item.get("count", 1),
+                item.get("cap"),
+                item["weights"],
+            )
+            for item in data["segments"]
+        ]
+        waves = [
+            Wave(item["at_s"] * 1000, item["count"], item["weights"])
+            for item in data.get("waves", ())
+        ]
+        return cls(data["first_spawn_ms"], segments, waves)
+
+    def segment_at(self, elapsed_ms):
+        for segment in self.segments:
+            if elapsed_ms < segment.end_ms:
+                return segment
+        return None
+
+
+def load_timeline(path=None):
+    with open(path or TIMELINE) as file:
+        return Timeline.from_dict(json.load(file))
+
+
+def edge_points(draws, count):
+    """x and y of `count` spawn points, each on a random screen edge."""
+    if np is None:
+        xs, ys = [], []
+        for _ in range(count):
+            edge = draws.randrange(4)
+            t = draws.random()
+            if edge == 0:  # top
+                xs.append(t * SCREEN_WIDTH)
+                ys.append(0.0)
+            elif edge == 1:  # bottom
+                xs.append(t * SCREEN_WIDTH)
+                ys.append(float(SCREEN_HEIGHT - SPRITE_HEIGHT))
+            elif edge == 2:  # left
+                xs.append(0.0)
+                ys.append(t * SCREEN_HEIGHT)
+            else:  # right
+                xs.append(float(SCREEN_WIDTH - SPRITE_WIDTH))
+                ys.append(t * SCREEN_HEIGHT)
+        return xs, ys
+
+    edge = draws.integers(0, 4, count)
+    t = draws.random(count)
+    horizontal = edge < 2
+    xs = np.where(
+        horizontal,
+        t * SCREEN_WIDTH,
+        np.where(edge == 2, 0.0, SCREEN_WIDTH - SPRITE_WIDTH),
+    )
+    ys = np.where(
+        horizontal,
+        np.where(edge == 0, 0.0, SCREEN_HEIGHT - SPRITE_HEIGHT),
+        t * SCREEN_HEIGHT,
+    )
+    return xs.tolist(), ys.tolist()
+
+
+class SpawnDirector:
+    """Decides every tick what spawns, following a Timeline.
+
+    Everything due in a tick, from the steady rate and from waves, is
+    picked and placed as whole batches, with NumPy when it is installed.
+    Batch draws come from a generator seeded off the "spawn" stream, so a
+    seed reproduces the same spawns on the same install.
+    """
+
+    def __init__(self, timeline):
+        self.timeline = timeline
+
+    def reset(self):
+        """Start the timeline over; call before the first update of a run.
+        Draws from the "spawn" stream, so call it once per run."""
+        spawn = rng.stream("spawn")
+        self.next_spawn_ms = spawn.randint(*self.timeline.first_spawn_ms)
+        self.segment_index = 0
+        self.wave_index = 0
+        batch_seed = spawn.getrandbits(64)
+        if np is None:
+            self.draws = random.Random(batch_seed)
+        else:
+            self.draws = np.random.default_rng(batch_seed)
+
+    def current_segment(self, elapsed_ms):
+        # Round time only moves forward, so the cursor does too
+        segments = self.timeline.segments
+        while (
+            self.segment_index < len(segments)
+            and elapsed_ms >= segments[self.segment_index].end_ms
+        ):
+            self.segment_index += 1
+        if self.segment_index == len(segments):
+            return None
+        return segments[self.segment_index]
+
+    def update(self, elapsed_ms, live):
+        """Batches due by elapsed_ms with `live` enemies on the field, as
+        (enemy classes, xs, ys) tuples."""
+        segment = self.current_segment(elapsed_ms)
+        if segment is None:
+            return []
+
+        # Waves always spawn in full; the cap only holds back the steady rate
+        due = []
+        waves = self.timeline.waves
+        while (
+            self.wave_index < len(waves) and elapsed_ms >= waves[self.wave_index].at_ms
+        ):
+            wave = waves[self.wave_index]
+            due.append((wave.table, wave.count))
+            live += wave.count
+            self.wave_index += 1
+
+        count = 0
+        spawn = rng.stream("spawn")
+        while elapsed_ms >= self.next_spawn_ms:
+            count += segment.count
+            self.next_spawn_ms += spawn.randint(*segment.interval_ms) / RATE_SCALE
+        if segment.cap is not None:
+            count = min(count, segment.cap - live)
+        if count > 0:
+            due.append((segment.table, count))
+
+        batches = []
+        for table, count in due:
+            xs, ys = edge_points(self.draws, count)
+            batches.append((table.choose(self.draws, count), xs, ys))
+        return batches
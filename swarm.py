@@ -0,0 +1,240 @@
+try:
+    import numpy as np
+except ImportError:  # the swarm backend is optional
+    np = None
+
+# Radians between the split directions of members stacked on one spot
+GOLDEN_ANGLE = 2.399963229728653
+
+
+def available():
+    return np is not None
+
+
+class Swarm:
+    """Struct-of-arrays store for enemy state.
+
+    Positions, speeds, health and hitbox half extents live in contiguous
+    NumPy arrays so every enemy can be advanced in one vectorized step.
+    Attached enemies read and write their `pos` and `health` through
+    views into these arrays, so the Enemy API keeps working for abilities.
+    """
+
+    def __init__(self, capacity=256):
+        if np is None:
+            raise RuntimeError("The swarm backend needs numpy installed.")
+        self.count = 0
+        self.members = []
+        self.pos = np.zeros((capacity, 2))
+        # Positions before the last step, for interpolated drawing
+        self.prev_pos = np.zeros((capacity, 2))
+        self.speed = np.zeros(capacity)
+        self.health = np.zeros(capacity)
+        self.extent = np.zeros((capacity, 2))
+        # First slot of the next separation pass over a large crowd
+        self.separation_start = 0
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        capacity = max(1, len(self.speed)) * 2
+        for name in ("pos", "prev_pos", "speed", "health", "extent"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:])
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def add(self, enemy):
+        if self.count == len(self.speed):
+            self.grow()
+        slot = self.count
+        self.pos[slot] = enemy.pos
+        self.prev_pos[slot] = enemy.prev_pos
+        self.speed[slot] = enemy.speed
+        self.health[slot] = enemy.health
+        self.extent[slot] = (enemy.hitbox.width / 2, enemy.hitbox.height / 2)
+        self.members.append(enemy)
+        self.count += 1
+        enemy.attach(self, slot)
+
+    def extend(self, enemies):
+        """Add a whole batch of freshly placed enemies in one pass."""
+        start = self.count
+        end = start + len(enemies)
+        while end > len(self.speed):
+            self.grow()
+        self.pos[start:end] = [enemy.pos for enemy in enemies]
+        self.prev_pos[start:end] = self.pos[start:end]
+        self.speed[start:end] = [enemy.speed for enemy in enemies]
+        self.health[start:end] = [enemy.health for enemy in enemies]
+        self.extent[start:end] = [
+            (enemy.hitbox.width / 2, enemy.hitbox.height / 2) for enemy in enemies
+        ]
+        self.members.extend(enemies)
+        self.count = end
+        for slot, enemy in enumerate(enemies, start):
+            enemy.attach(self, slot)
+
+    def clear(self):
+        """Detach every member and start separation over, for a new run."""
+        for enemy in self.members:
+            enemy.detach()
+        self.members.clear()
+        self.count = 0
+        self.separation_start = 0
+
+    def remove(self, enemy):
+        slot = enemy.slot
+        enemy.detach()
+        last = self.count - 1
+        if slot != last:
+            # Move the last member into the freed slot
+            moved = self.members[last]
+            for array in (
+                self.pos,
+                self.prev_pos,
+                self.speed,
+                self.health,
+                self.extent,
+            ):
+                array[slot] = array[last]
+            self.members[slot] = moved
+            moved.slot = slot
+        self.members.pop()
+        self.count -= 1
+
+    def step(self, target, dt):
+        """Advance every member toward target by dt seconds, like
+        Enemy.move_toward."""
+        n = self.count
+        if n == 0:
+            return
+        pos = self.pos[:n]
+        self.prev_pos[:n] = pos
+        delta = np.asarray(target, dtype=float) - pos
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        scale = np.divide(
+            self.speed[:n] * dt, distance, out=np.zeros(n), where=distance > 0
+        )
+        pos += delta * scale[:, None]
+
+    def separate(self, radius, strength, dt, budget):
+        """Push members closer than `radius` apart, in one batched pass.
+
+        Members are binned into a grid of radius-sized cells and each one
+        checks its own and the 8 surrounding cells. The push falls off
+        linearly with distance and moves a member at most `strength` px/s.
+        At most about `budget` neighbour pairs are checked per call. In a
+        dense crowd each member samples the same number of neighbours from
+        each cell, starting after its own place so samples differ between
+        members, and a sample counts for all the neighbours it stands in
+        for. Crowds of more than budget / 9 members are pushed in rotating
+        slices.
+        """
+        n = self.count
+        if n < 2:
+            return
+        pos = self.pos[:n]
+        # A crowd too large for the budget is pushed a slice at a time,
+        # each slice by a proportionally longer step
+        active_count = min(n, max(1, budget // 9))
+        active = (self.separation_start + np.arange(active_count)) % n
+        self.separation_start = (self.separation_start + active_count) % n
+        step = strength * dt * n / active_count
+        per_cell = max(1, budget // (9 * active_count))
+
+        # Pack cell coordinates into one sortable key, leaving a spare
+        # row and column so neighbouring keys never wrap
+        cells = np.floor(pos / radius).astype(np.int64)
+        cells -= cells.min(axis=0) - 1
+        height = cells[:, 1].max() + 2
+        keys = cells[:, 0] * height + cells[:, 1]
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        # Occupied cells: key, first sorted member and member count
+        first = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        cell_keys = sorted_keys[first]
+        cell_sizes = np.diff(np.r_[first, n])
+        cell_of = np.empty(n, dtype=np.int64)
+        cell_of[order] = np.repeat(np.arange(len(first)), cell_sizes)
+        # Place of every member within its own cell
+        place = np.empty(n, dtype=np.int64)
+        place[order] = np.arange(n) - np.repeat(first, cell_sizes)
+
+        # Own and surrounding cells of every occupied cell, as (9, cells)
+        offsets = np.array([dx * height + dy for dx in (-1, 0, 1) for dy in (-1, 0, 1)])
+        target = cell_keys + offsets[:, None]
+        index = np.minimum(np.searchsorted(cell_keys, target), len(first) - 1)
+        found = np.where(cell_keys[index] == target, cell_sizes[index], 0)
+        # ... and of every member, as flat (9 * n) ranges of sorted members
+        active_cells = cell_of[active]
+        found = found[:, active_cells].ravel()
+        start = first[index][:, active_cells].ravel()
+        take = np.minimum(found, per_cell)
+        total = int(take.sum())
+        i = np.repeat(np.tile(active, 9), take)
+        rank = np.arange(total) - np.repeat(np.cumsum(take) - take, take)
+        # Samples start right after the member's own place, so a member
+        # alone in its budget never just picks itself
+        sample = (place[i] + 1 + rank) % np.repeat(found, take)
+        j = order[np.repeat(start, take) + sample]
+        # Each sample stands in for every neighbour of its cell
+        represents = np.repeat(found / np.maximum(take, 1), take)
+
+        x = pos[:, 0].copy()
+        y = pos[:, 1].copy()
+        dx = x[i] - x[j]
+        dy = y[i] - y[j]
+        distance_sq = dx * dx + dy * dy
+        near = np.flatnonzero((distance_sq < radius * radius) & (i != j))
+        if len(near) == 0:
+            return
+        i, dx, dy, represents = i[near], dx[near], dy[near], represents[near]
+        distance = np.sqrt(distance_sq[near])
+        # Members on exactly the same spot split along a fixed direction
+        # per slot instead of not moving at all
+        stacked = distance == 0
+        if stacked.any():
+            angle = i[stacked] * GOLDEN_ANGLE
+            dx[stacked] = np.cos(angle)
+            dy[stacked] = np.sin(angle)
+            distance[stacked] = 1.0
+        weight = represents * (1.0 - distance / radius) / distance
+        push_x = np.bincount(i, dx * weight, minlength=n)
+        push_y = np.bincount(i, dy * weight, minlength=n)
+        # Summed pushes longer than 1 are cut back to 1, so nobody moves
+        # faster than strength
+        scale = step / np.maximum(np.sqrt(push_x**2 + push_y**2), 1.0)
+        pos[:, 0] += push_x * scale
+        pos[:, 1] += push_y * scale
+
+    def sync(self, view=None):
+        """Copy positions into the rects of members inside `view`.
+
+        Members outside the view keep their last rects, as nothing draws
+        them. Pass no view to sync everyone. Hitboxes are left alone: the
+        enemy grid indexed them this tick, and the round moves them onto
+        the rects once its queries are done.
+        """
+        n = self.count
+        if n == 0:
+            return
+        centers = np.rint(self.pos[:n]).astype(int)
+        if view is None:
+            slots = range(n)
+        else:
+            ext = self.extent[:n]
+            x, y = self.pos[:n, 0], self.pos[:n, 1]
+            visible = (
+                (x + ext[:, 0] >= view.left)
+                & (x - ext[:, 0] <= view.right)
+                & (y + ext[:, 1] >= view.top)
+                & (y - ext[:, 1] <= view.bottom)
+            )
+            slots = np.flatnonzero(visible)
+        members = self.members
+        for slot in slots:
+            enemy = members[slot]
+            center = (int(centers[slot, 0]), int(centers[slot, 1]))
+            enemy.rect.center = center
@@ -0,0 +1,71 @@
+from collections import OrderedDict
+import pygame
+
+FONT_PATH = "./assets/fonts/PublicPixel-rv0pA.ttf"
+
+
+class TextCache:
+    """Rendered text surfaces keyed by (font, size, text, color), with LRU
+    eviction once `capacity` surfaces are held. Fonts are opened once."""
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, size, path=FONT_PATH):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size, color, path=FONT_PATH):
+        """Shared antialiased surface for text. Callers must not draw onto it."""
+        key = (path, size, text, tuple(color))
+        surfaces = self.surfaces
+        surface = surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(size, path).render(text, True, color)
+        surfaces[key] = surface
+        if len(surfaces) > self.capacity:
+            surfaces.popitem(last=False)
+        return surface
+
+
+class DigitAtlas:
+    """Pre-rendered glyphs for composing numeric strings such as "09:55"
+    with a few blits instead of a font render."""
+
+    def __init__(self, size, color, chars="0123456789:", path=FONT_PATH):
+        font = cache.font(size, path)
+        self.glyphs = {char: font.render(char, True, color) for char in chars}
+        self.height = max(glyph.get_height() for glyph in self.glyphs.values())
+
+    def width(self, text):
+        return sum(self.glyphs[char].get_width() for char in text)
+
+    def compose(self, text):
+        surface = pygame.Surface((self.width(text), self.height), pygame.SRCALPHA)
+        x = 0
+        for char in text:
+            glyph = self.glyphs[char]
+            surface.blit(glyph, (x, 0))
+            x += glyph.get_width()
+        return surface
+
+
+# Process-wide text cache shared by the UI widgets
+cache = TextCache()
+
+
+def render(text, size, color):
+    return cache.render(text, size, color)
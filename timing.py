@@ -0,0 +1,39 @@
+import pygame
+
+# The simulation always advances in steps of this length
+STEP_MS = 1000 / 60
+FIXED_DT = STEP_MS / 1000
+
+
+class SystemClock:
+    """Wall-clock milliseconds since pygame.init()."""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class FixedClock:
+    """Simulated milliseconds that only move when advance() is called."""
+
+    def __init__(self, step_ms=STEP_MS, start_ms=0):
+        self.step_ms = step_ms
+        self.now = start_ms
+
+    def advance(self, ms=None):
+        self.now += self.step_ms if ms is None else ms
+
+    def get_ticks(self):
+        return int(self.now)
+
+
+# Clock read by gameplay code, swapped out for headless runs
+clock = SystemClock()
+
+
+def get_ticks():
+    return clock.get_ticks()
+
+
+def use_clock(new_clock):
+    global clock
+    clock = new_clock
@@ -1,17 +1,23 @@
 import pygame
-from constants import SCREEN_WIDTH
+import assets
+import text
+from constants import SCREEN_WIDTH, SCREEN_HEIGHT
 
 
 class Score:
     def __init__(self, player):
         self.player = player
-        self.font = pygame.font.Font("./assets/fonts/PublicPixel-rv0pA.ttf", 36)
         self.text_color = (255, 255, 255)
+        self.shown_score = None
         self.update()
 
     def update(self):
+        # Only re-render when the score changes
+        if self.player.score == self.shown_score:
+            return
+        self.shown_score = self.player.score
         score_text = f"Score: {self.player.score}"
-        self.score_surface = self.font.render(score_text, True, self.text_color)
+        self.score_surface = text.render(score_text, 36, self.text_color)
         self.score_rect = self.score_surface.get_rect()
         self.score_rect.topright = (SCREEN_WIDTH - 140, 20)
 
@@ -21,38 +27,40 @@ class Score:
         bg_rect = self.score_rect.inflate(20, 10)
         pygame.draw.rect(screen, (0, 0, 0, 180), bg_rect)
         screen.blit(self.score_surface, self.score_rect)
+        return bg_rect
 
 
 class Timer:
     def __init__(self):
-        self.image = pygame.image.load(
-            "./assets/images/user-interface/time.png"
-        ).convert_alpha()
+        self.image = assets.load_image("./assets/images/user-interface/time.png")
         self.image_rect = self.image.get_rect()
-        self.font = pygame.font.Font("./assets/fonts/PublicPixel-rv0pA.ttf", 24)
         self.text_color = (255, 255, 255)
+        self.digits = text.DigitAtlas(24, self.text_color)
+        self.shown_seconds = None
 
     def update(self, rem_seconds):
+        # Only re-compose when the displayed second changes
+        if rem_seconds == self.shown_seconds:
+            return
+        self.shown_seconds = rem_seconds
         minutes = rem_seconds // 60
         seconds = rem_seconds % 60
         timer_text = f"{minutes:02d}:{seconds:02d}"
-        self.timer_surface = self.font.render(timer_text, True, self.text_color)
+        self.timer_surface = self.digits.compose(timer_text)
         self.timer_rect = self.timer_surface.get_rect()
         self.timer_rect.topright = (SCREEN_WIDTH - 25, 28)
         self.image_rect.midtop = (SCREEN_WIDTH - 20, -42)
 
     def draw(self, screen, seconds):
         self.update(seconds)
-        screen.blit(self.image, self.image_rect)
-        screen.blit(self.timer_surface, self.timer_rect)
+        image_area = screen.blit(self.image, self.image_rect)
+        return image_area.union(screen.blit(self.timer_surface, self.timer_rect))
 
 
 class HealthBar:
     def __init__(self, player):
         self.player = player
-        self.image = pygame.image.load(
-            "./assets/images/user-interface/Heart_Bar_3.png"
-        ).convert_alpha()
+        self.image = assets.load_image("./assets/images/user-interface/Heart_Bar_3.png")
         self.image_rect = self.image.get_rect()
         self.health_bar_width = 282
         self.health_bar_height = 22
@@ -76,31 +84,34 @@ class HealthBar:
         self.update()
         pygame.draw.rect(screen, self.bg_color, self.health_rect)
         pygame.draw.rect(screen, self.health_color, self.current_health_rect)
-        screen.blit(self.image, self.image_rect)
+        return screen.blit(self.image, self.image_rect).union(self.health_rect)
 
 
 class PlayerLevel:
     def __init__(self, player):
         self.player = player
-        self.font = pygame.font.Font("./assets/fonts/PublicPixel-rv0pA.ttf", 24)
         self.text_color = (255, 255, 255)
+        self.shown_level = None
         self.update()
 
     def update(self):
+        # Only re-render when the level changes
+        if self.player.level == self.shown_level:
+            return
+        self.shown_level = self.player.level
         self.text = str(self.player.level)
         if self.player.level >= 10:
-            self.font = pygame.font.Font("./assets/fonts/PublicPixel-rv0pA.ttf", 16)
-            self.level_surface = self.font.render(self.text, True, self.text_color)
+            self.level_surface = text.render(self.text, 16, self.text_color)
             self.level_rect = self.level_surface.get_rect()
             self.level_rect.topright = (52, 26)
         else:
-            self.level_surface = self.font.render(self.text, True, self.text_color)
+            self.level_surface = text.render(self.text, 24, self.text_color)
             self.level_rect = self.level_surface.get_rect()
             self.level_rect.topright = (52, 22)
 
     def draw(self, screen):
         self.update()
-        screen.blit(self.level_surface, self.level_rect)
+        return screen.blit(self.level_surface, self.level_rect)
 
 
 class ExperienceBar:
@@ -153,3 +164,97 @@ class ExperienceBar:
 
         # 3. Level number on top
         # screen.blit(self.level_surface, self.level_rect)
+
+        return self.bar_rect
+
+
+class LoadingBar:
+    """Progress bar shown on the title screen while assets preload."""
+
+    def __init__(self, width=400, height=14):
+        self.color = (255, 255, 255)
+        self.rect = pygame.Rect(0, 0, width, height)
+        self.rect.midbottom = (SCREEN_WIDTH // 2, SCREEN_HEIGHT - 60)
+        self.label = text.render("Loading", 16, self.color)
+        self.label_rect = self.label.get_rect(
+            midbottom=(self.rect.centerx, self.rect.top - 8)
+        )
+
+    def draw(self, screen, progress):
+        pygame.draw.rect(screen, self.color, self.rect, 1)
+        fill = self.rect.inflate(-4, -4)
+        fill.width = int(fill.width * progress)
+        if fill.width > 0:
+            pygame.draw.rect(screen, self.color, fill)
+        screen.blit(self.label, self.label_rect)
+        return self.rect.union(self.label_rect)
+
+
+class ProfilerOverlay:
+    """Debug panel with rolling section timings, entity counts and a
+    frame-time histogram. Toggled with F3."""
+
+    def __init__(self, profiler, game_round):
+        self.profiler = profiler
+        self.game_round = game_round
+        self.font = text.cache.font(8)
+        self.text_color = (255, 255, 255)
+        self.bar_color = (0, 200, 255)
+        self.bg_color = (0, 0, 0, 180)
+        self.pos = (10, 100)
+        self.line_height = 12
+        self.width = 260
+        self.visible = False
+        # Re-render the text only every few frames, rendering is not free
+        self.refresh_frames = 15
+        self.frames_until_refresh = 0
+        self.lines = []
+        self.panel = None
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames_until_refresh = 0
+
+    def update(self):
+        profiler = self.profiler
+        text = [f"frame {profiler.frame_time():6.2f} ms"]
+        for name, ms in profiler.averages().items():
+            text.append(f"{name:<12}{ms:6.2f} ms")
+        counts = self.game_round.entity_counts()
+        text.append(" ".join(f"{name}:{count}" for name, count in counts.items()))
+        self.lines = [self.font.render(t, True, self.text_color) for t in text]
+
+        height = (len(self.lines) + 5) * self.line_height
+        self.panel = pygame.Surface((self.width, height), pygame.SRCALPHA)
+        self.panel.fill(self.bg_color)
+
+    def draw_histogram(self, screen, top):
+        counts = self.profiler.histogram()
+        total = max(1, sum(counts))
+        bar_width = (self.width - 20) // len(counts)
+        max_height = 4 * self.line_height
+        for i, count in enumerate(counts):
+            height = int(max_height * count / total)
+            bar = pygame.Rect(
+                self.pos[0] + 10 + i * bar_width,
+                top + max_height - height,
+                bar_width - 2,
+                height,
+            )
+            pygame.draw.rect(screen, self.bar_color, bar)
+
+    def draw(self, screen):
+        """Draws the panel if visible. Returns the area drawn, or None."""
+        if not self.visible:
+            return None
+        if self.frames_until_refresh <= 0:
+            self.update()
+            self.frames_until_refresh = self.refresh_frames
+        self.frames_until_refresh -= 1
+
+        x, y = self.pos
+        screen.blit(self.panel, self.pos)
+        for i, line in enumerate(self.lines):
+            screen.blit(line, (x + 6, y + 6 + i * self.line_height))
+        self.draw_histogram(screen, y + 6 + len(self.lines) * self.line_height)
+        return self.panel.get_rect(topleft=self.pos)